@@ -50,33 +50,33 @@ def get_numeric_value(value):
 @st.cache_data
 def get_unique_values():
     ALL_AREAS = sorted(
-        list(set(normalize_area_name(p.get("Area", "N/A")) for p in properties_data))
+        {normalize_area_name(p.get("Area", "N/A")) for p in properties_data}
     )
     
     ALL_ZONES = sorted(
-        list(set(normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data))
+        {normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data}
     )
     
     ALL_FACILITIES = []
     for p in properties_data:
         if "Facilities" in p and isinstance(p["Facilities"], dict):
-            ALL_FACILITIES = sorted(list(p["Facilities"].keys()))
+            ALL_FACILITIES = sorted(p["Facilities"])
             break
     
     ALL_NEARBY_AMENITIES = []
     for p in properties_data:
         if "Nearby_Amenities" in p and isinstance(p["Nearby_Amenities"], dict):
-            ALL_NEARBY_AMENITIES = sorted(list(p["Nearby_Amenities"].keys()))
+            ALL_NEARBY_AMENITIES = sorted(p["Nearby_Amenities"])
             break
     
     ALL_ROOM_TYPES = sorted(
-        list(set(normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A"))
-                 for p in properties_data if p.get("Room_Details", {}).get("Rooms")))
+        {normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A"))
+         for p in properties_data if p.get("Room_Details", {}).get("Rooms")}
     )
     
     ALL_PROPERTY_TYPES = sorted(
-        list(set(normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A"))
-                 for p in properties_data if p.get("Room_Details", {}).get("Type")))
+        {normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A"))
+         for p in properties_data if p.get("Room_Details", {}).get("Type")}
     )
     
     return {
@@ -167,14 +167,14 @@ def filter_properties(user_input, field, data):
         filtered_properties = [p for p in data if str(p.get(data_field, "N/A")).lower() == normalized_user_input]
     
     elif field == "facilities":
-        user_facilities = [normalize_facility_name(f) for f in user_input.split(',')]
+        user_facilities = {normalize_facility_name(f) for f in user_input.split(',')}
         filtered_properties = [p for p in data if all(
             normalize_facility_name(k) in user_facilities and v == 1
             for k, v in p.get("Facilities", {}).items() if k
         )]
     
     elif field == "nearby_amenities":
-        user_amenities = [normalize_amenity_name(f) for f in user_input.split(',')]
+        user_amenities = {normalize_amenity_name(f) for f in user_input.split(',')}
         filtered_properties = [p for p in data if all(
             normalize_amenity_name(k) in user_amenities and v == 1
             for k, v in p.get("Nearby_Amenities", {}).items() if k
@@ -187,13 +187,15 @@ def filter_properties(user_input, field, data):
         filtered_properties = [p for p in data if normalize_property_type_name(p.get("Room_Details", {}).get("Type", "")) == normalized_user_input]
     
     elif field == "area":
-        filtered_properties = [p for p in data if normalize_area_name(p.get("Area", "N/A")) == normalize_area_name(user_input)]
+        user_area = normalize_area_name(user_input)
+        filtered_properties = [p for p in data if normalize_area_name(p.get("Area", "N/A")) == user_area]
     
     elif field == "zone":
-        filtered_properties = [p for p in data if normalize_zone_name(p.get("Zone", "N/A")) == normalize_zone_name(user_input)]
+        user_zone = normalize_zone_name(user_input)
+        filtered_properties = [p for p in data if normalize_zone_name(p.get("Zone", "N/A")) == user_zone]
         
     elif field == "id":
-        property_ids = [pid.strip().lower() for pid in user_input.split(",")]
+        property_ids = {pid.strip().lower() for pid in user_input.split(",")}
         filtered_properties = [p for p in data if str(p.get("Property_ID", "")).lower() in property_ids]
     
     else:
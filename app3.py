@@ -9,6 +9,7 @@ from collections import defaultdict
 import re
 import math
 from math import radians, sin, cos, sqrt, atan2
+from operator import itemgetter
 import requests
 
 # Set page configuration
@@ -19,6 +20,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Flatten nested fields the filters read into top-level keys ---
+def denormalize_properties(data):
+    for p in data:
+        charges = p.get("charges", {})
+        if "lock_in_period_in_months" in charges:
+            p["_lock_in"] = charges["lock_in_period_in_months"]
+        p["_furnishing"] = p.get("facilities", {}).get("furnishing")
+    return data
+
 # --- Load properties from JSON file ---
 @st.cache_data
 def load_properties():
@@ -29,7 +39,7 @@ def load_properties():
             nagpur_properties = [p for p in properties if 
                               p.get("city", "").lower() == "nagpur" or 
                               p.get("area", "").lower().find("nagpur") != -1]
-            return nagpur_properties
+            return denormalize_properties(nagpur_properties)
     except FileNotFoundError:
         st.error("Error: 'commercial_data.json' not found. Please ensure the file exists.")
         return []
@@ -145,161 +155,66 @@ def format_property(prop, distance=None):
         f"**Available Floors:** {floors_str}"
     )
 
+# --- Fields matched case-insensitively against a value or list of values ---
+STRING_FILTER_FIELDS = [
+    "city", "area", "zone", "property_type", "ownership", "possession_status",
+    "location_hub", "property_id", "floor_no", "brokerage", "negotiable"
+]
+
+# --- min_/max_ filter suffix -> numeric field ---
+RANGE_FILTER_FIELDS = {
+    "rent": "rent_price", "size": "size_in_sqft", "carpet_area": "carpet_area_sqft",
+    "age": "property_age", "security_deposit": "security_deposit",
+    "total_floors": "total_floors", "lock_in_period": "_lock_in"
+}
+
+furnishing_of = itemgetter("_furnishing")
+
+# --- Build the per-property test for one filter ---
+def make_filter_predicate(filter_type, value):
+    """Return (cost, predicate) for one filter, or None when the filter does not apply.
+    
+    cost orders the predicates so cheap numeric checks run first.
+    """
+    if filter_type in STRING_FILTER_FIELDS and value:
+        # Handle both single value and list of values
+        wanted = {v.lower() for v in value} if isinstance(value, list) else {value.lower()}
+        return 1, lambda p: str(p.get(filter_type, "")).lower() in wanted
+    
+    if filter_type.startswith(("min_", "max_")) and filter_type[4:] in RANGE_FILTER_FIELDS and value is not None:
+        field = RANGE_FILTER_FIELDS[filter_type[4:]]
+        if filter_type.startswith("min_"):
+            return 0, lambda p: p.get(field, 0) >= value
+        return 0, lambda p: p.get(field, float('inf')) <= value
+    
+    if filter_type == "furnishing" and value:
+        if isinstance(value, list):
+            # For multiple selections, we want properties that match ANY of the selected options
+            wanted = {v.lower() for v in value}
+            return 1, lambda p: ("furnished" if furnishing_of(p) == 1 else "unfurnished") in wanted
+        furnishing_value = 1 if value.lower() == "furnished" else 0
+        return 1, lambda p: furnishing_of(p) == furnishing_value
+    
+    if filter_type == "facilities" and value:
+        # Properties must have ALL the selected facilities (AND logic)
+        user_facilities = [normalize_facility_name(f) for f in value]
+        return 2, lambda p: all(p.get("facilities", {}).get(fac) == 1 for fac in user_facilities)
+    
+    if filter_type == "floor" and value:
+        # Properties must have the selected floor available
+        user_floor = normalize_facility_name(value)
+        return 1, lambda p: p.get("floor_availability", {}).get(user_floor) == 1
+    
+    return None
+
 # --- Function to filter properties by multiple criteria ---
 def filter_properties(data, filters):
     """Filter properties based on multiple criteria (AND logic)."""
-    filtered = data.copy()
-    
-    # Apply each filter separately (AND logic)
-    for filter_type, value in filters.items():
-        if filter_type == "city" and value:
-            filtered = [p for p in filtered if p.get("city", "").lower() == value.lower()]
-        
-        elif filter_type == "area" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("area", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("area", "").lower() == value.lower()]
-        
-        elif filter_type == "zone" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("zone", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("zone", "").lower() == value.lower()]
-        
-        elif filter_type == "property_type" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("property_type", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("property_type", "").lower() == value.lower()]
-        
-        elif filter_type == "ownership" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("ownership", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("ownership", "").lower() == value.lower()]
-        
-        elif filter_type == "possession_status" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("possession_status", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("possession_status", "").lower() == value.lower()]
-        
-        elif filter_type == "location_hub" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("location_hub", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("location_hub", "").lower() == value.lower()]
-        
-        elif filter_type == "property_id" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("property_id", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("property_id", "").lower() == value.lower()]
-        
-        elif filter_type == "floor_no" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("floor_no", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("floor_no", "").lower() == value.lower()]
-        
-        elif filter_type == "min_rent" and value is not None:
-            filtered = [p for p in filtered if p.get("rent_price", 0) >= value]
-        
-        elif filter_type == "max_rent" and value is not None:
-            filtered = [p for p in filtered if p.get("rent_price", float('inf')) <= value]
-        
-        elif filter_type == "min_size" and value is not None:
-            filtered = [p for p in filtered if p.get("size_in_sqft", 0) >= value]
-        
-        elif filter_type == "max_size" and value is not None:
-            filtered = [p for p in filtered if p.get("size_in_sqft", float('inf')) <= value]
-        
-        elif filter_type == "min_carpet_area" and value is not None:
-            filtered = [p for p in filtered if p.get("carpet_area_sqft", 0) >= value]
-        
-        elif filter_type == "max_carpet_area" and value is not None:
-            filtered = [p for p in filtered if p.get("carpet_area_sqft", float('inf')) <= value]
-        
-        elif filter_type == "min_age" and value is not None:
-            filtered = [p for p in filtered if p.get("property_age", 0) >= value]
-        
-        elif filter_type == "max_age" and value is not None:
-            filtered = [p for p in filtered if p.get("property_age", float('inf')) <= value]
-        
-        elif filter_type == "min_security_deposit" and value is not None:
-            filtered = [p for p in filtered if p.get("security_deposit", 0) >= value]
-        
-        elif filter_type == "max_security_deposit" and value is not None:
-            filtered = [p for p in filtered if p.get("security_deposit", float('inf')) <= value]
-        
-        elif filter_type == "min_total_floors" and value is not None:
-            filtered = [p for p in filtered if p.get("total_floors", 0) >= value]
-        
-        elif filter_type == "max_total_floors" and value is not None:
-            filtered = [p for p in filtered if p.get("total_floors", float('inf')) <= value]
-        
-        elif filter_type == "min_lock_in_period" and value is not None:
-            filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", 0) >= value]
-        
-        elif filter_type == "max_lock_in_period" and value is not None:
-            filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", float('inf')) <= value]
-        
-        elif filter_type == "furnishing" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                # For multiple selections, we want properties that match ANY of the selected options
-                temp_filtered = []
-                for p in filtered:
-                    furnishing_status = "Furnished" if p.get("facilities", {}).get("furnishing") == 1 else "Unfurnished"
-                    if furnishing_status.lower() in [v.lower() for v in value]:
-                        temp_filtered.append(p)
-                filtered = temp_filtered
-            else:
-                furnishing_value = 1 if value.lower() == "furnished" else 0
-                filtered = [p for p in filtered if p.get("facilities", {}).get("furnishing") == furnishing_value]
-        
-        elif filter_type == "brokerage" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("brokerage", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("brokerage", "").lower() == value.lower()]
-        
-        elif filter_type == "negotiable" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("negotiable", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("negotiable", "").lower() == value.lower()]
-        
-        elif filter_type == "facilities" and value:
-            # Normalize user facilities
-            user_facilities = [normalize_facility_name(f) for f in value]
-            # Filter properties that have ALL the selected facilities (AND logic)
-            temp_filtered = []
-            for p in filtered:
-                facilities = p.get("facilities", {})
-                # Check if the property has every facility in user_facilities
-                if all(facilities.get(fac) == 1 for fac in user_facilities):
-                    temp_filtered.append(p)
-            filtered = temp_filtered
-        
-        elif filter_type == "floor" and value:
-            # Normalize user floor selection
-            user_floor = normalize_facility_name(value)
-            # Filter properties that have the selected floor available
-            filtered = [p for p in filtered if p.get("floor_availability", {}).get(user_floor) == 1]
+    tests = [test for test in (make_filter_predicate(t, v) for t, v in filters.items()) if test is not None]
+    predicates = [predicate for _, predicate in sorted(tests, key=lambda test: test[0])]
     
-    return filtered
+    # One pass over the data, checking every filter per property
+    return [p for p in data if all(predicate(p) for predicate in predicates)]
 
 # --- Function to get unique values for a field ---
 def get_unique_values(data, field):
@@ -343,7 +258,7 @@ def compare_properties_side_by_side(data, property_ids):
     # Collect all possible comparison keys
     comparison_keys = set()
     for p in selected:
-        comparison_keys.update(p.keys())
+        comparison_keys.update(k for k in p.keys() if not k.startswith("_"))
         if isinstance(p.get("facilities"), dict):
             comparison_keys.update([f"Facility: {k}" for k in p["facilities"].keys()])
         if isinstance(p.get("floor_availability"), dict):
@@ -951,7 +866,8 @@ def main():
                             color="property_type",
                             hover_name="listing_title",
                             labels={"size_in_sqft": "Size (sqft)", "rent_price": "Rent (₹)"},
-                            title="Size vs Rent by Property Type"
+                            title="Size vs Rent by Property Type",
+                            render_mode="webgl"
                         )
                         st.plotly_chart(fig_scatter, use_container_width=True)
                         
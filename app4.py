@@ -111,33 +111,33 @@ def haversine_distance(lat1, lon1, lat2, lon2):
 
 # --- Dynamically get all unique values from the dataset ---
 ALL_AREAS = sorted(
-    list(set(normalize_area_name(p.get("Area", "N/A")) for p in properties_data))
+    {normalize_area_name(p.get("Area", "N/A")) for p in properties_data}
 )
 
 ALL_ZONES = sorted(
-    list(set(normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data))
+    {normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data}
 )
 
 ALL_FACILITIES = []
 for p in properties_data:
     if "Facilities" in p and isinstance(p["Facilities"], dict):
-        ALL_FACILITIES = sorted(list(p["Facilities"].keys()))
+        ALL_FACILITIES = sorted(p["Facilities"])
         break
 
 ALL_NEARBY_AMENITIES = []
 for p in properties_data:
     if "Nearby_Amenities" in p and isinstance(p["Nearby_Amenities"], dict):
-        ALL_NEARBY_AMENITIES = sorted(list(p["Nearby_Amenities"].keys()))
+        ALL_NEARBY_AMENITIES = sorted(p["Nearby_Amenities"])
         break
 
 ALL_ROOM_TYPES = sorted(
-    list(set(normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A"))
-             for p in properties_data if p.get("Room_Details", {}).get("Rooms")))
+    {normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A"))
+     for p in properties_data if p.get("Room_Details", {}).get("Rooms")}
 )
 
 ALL_PROPERTY_TYPES = sorted(
-    list(set(normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A"))
-             for p in properties_data if p.get("Room_Details", {}).get("Type")))
+    {normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A"))
+     for p in properties_data if p.get("Room_Details", {}).get("Type")}
 )
 
 # --- Comparison Function ---
@@ -271,17 +271,19 @@ def filter_properties(user_input, field, data):
 
     # --- Area field ---
     elif field == "area":
+        user_area = normalize_area_name(user_input)
         filtered_properties = [p for p in data if 
-                              normalize_area_name(p.get("Area", "N/A")) == normalize_area_name(user_input)]
+                              normalize_area_name(p.get("Area", "N/A")) == user_area]
 
     # --- Zone field ---
     elif field == "zone":
+        user_zone = normalize_zone_name(user_input)
         filtered_properties = [p for p in data if 
-                              normalize_zone_name(p.get("Zone", "N/A")) == normalize_zone_name(user_input)]
+                              normalize_zone_name(p.get("Zone", "N/A")) == user_zone]
         
     # --- Property ID field ---
     elif field == "id":
-        property_ids = [pid.strip().lower() for pid in user_input.split(",")]
+        property_ids = {pid.strip().lower() for pid in user_input.split(",")}
         filtered_properties = [p for p in data if str(p.get("property_id", "")).lower() in property_ids]
     
     # --- Numeric fields ---
@@ -545,12 +547,12 @@ def main():
     
     # Category options for dropdowns
     CATEGORY_OPTIONS = {
-        "brokerage": sorted(list(set(str(p.get("Brokerage", "N/A")).lower() for p in properties_data))),
-        "furnishing": sorted(list(set(str(p.get("Furnishing_Status", "N/A")).lower() for p in properties_data))),
-        "maintenance": sorted(list(set(str(p.get("Maintenance_Charge", "N/A")).lower() for p in properties_data))),
-        "recommended_for": sorted(list(set(str(p.get("Recommended_For", "N/A")).lower() for p in properties_data))),
-        "water_supply": sorted(list(set(str(p.get("Water_Supply_Type", "N/A")).lower() for p in properties_data))),
-        "society_type": sorted(list(set(str(p.get("Society_Type", "N/A")).lower() for p in properties_data))),
+        "brokerage": sorted({str(p.get("Brokerage", "N/A")).lower() for p in properties_data}),
+        "furnishing": sorted({str(p.get("Furnishing_Status", "N/A")).lower() for p in properties_data}),
+        "maintenance": sorted({str(p.get("Maintenance_Charge", "N/A")).lower() for p in properties_data}),
+        "recommended_for": sorted({str(p.get("Recommended_For", "N/A")).lower() for p in properties_data}),
+        "water_supply": sorted({str(p.get("Water_Supply_Type", "N/A")).lower() for p in properties_data}),
+        "society_type": sorted({str(p.get("Society_Type", "N/A")).lower() for p in properties_data}),
         "area": ALL_AREAS,
         "zone": ALL_ZONES,
         "room_type": ALL_ROOM_TYPES,
@@ -755,8 +757,8 @@ def main():
                     
                     # Create analytics visualizations
                     if results:
-                        # Convert to DataFrame for easier analysis
-                        df = pd.DataFrame(results)
+                        # Convert to DataFrame for easier analysis (nested fields become "Parent.Child" columns)
+                        df = pd.json_normalize(results, sep=".")
                         
                         # Rent distribution
                         st.subheader("Rent Distribution in Nagpur")
@@ -771,8 +773,7 @@ def main():
                         
                         # Property types
                         st.subheader("Property Types in Nagpur")
-                        prop_types = [prop.get("Room_Details", {}).get("Type", "Unknown") for prop in results]
-                        type_counts = pd.Series(prop_types).value_counts()
+                        type_counts = df.get("Room_Details.Type", pd.Series("Unknown", index=df.index)).fillna("Unknown").value_counts()
                         
                         fig_types = px.pie(
                             values=type_counts.values,
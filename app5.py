@@ -1,6 +1,7 @@
 import streamlit as st
 import json
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
@@ -11,6 +12,12 @@ import math
 from math import radians, sin, cos, sqrt, atan2
 import requests
 
+# numba is optional; when present the facilities check is compiled and run across cores
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Set page configuration
 st.set_page_config(
     page_title="Commercial Property Search - Nagpur",
@@ -19,6 +26,130 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Fields matched case-insensitively by filter_properties ---
+STRING_FILTER_FIELDS = [
+    "city", "area", "zone", "property_type", "ownership", "possession_status",
+    "location_hub", "property_id", "floor_no", "brokerage", "negotiable"
+]
+
+# --- min_/max_ filter suffix -> numeric column ---
+RANGE_FILTER_FIELDS = {
+    "rent": "rent_price", "size": "size_in_sqft", "carpet_area": "carpet_area_sqft",
+    "age": "property_age", "security_deposit": "security_deposit",
+    "total_floors": "total_floors", "lock_in_period": "lock_in_period_in_months"
+}
+
+# --- Columnar view of the properties for vectorized filtering ---
+def build_properties_frame(properties):
+    """Row i of the frame describes properties[i]."""
+    frame = pd.DataFrame({
+        field: [str(p.get(field, "")).lower() for p in properties]
+        for field in STRING_FILTER_FIELDS
+    })
+    for column in RANGE_FILTER_FIELDS.values():
+        if column == "lock_in_period_in_months":
+            values = [p.get("charges", {}).get(column) for p in properties]
+        else:
+            values = [p.get(column) for p in properties]
+        frame[column] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+    facilities_frame = pd.DataFrame([p.get("facilities", {}) for p in properties]).add_prefix("facility:")
+    floors_frame = pd.DataFrame([p.get("floor_availability", {}) for p in properties]).add_prefix("floor:")
+    return pd.concat([frame, facilities_frame, floors_frame], axis=1)
+
+# --- Struct-of-arrays copy of the filterable columns ---
+def build_property_columns(frame):
+    """Plain NumPy arrays for the string and range filters; element i describes row i.
+    
+    String fields become (codes, {value: code}) pairs. Range fields are stored
+    twice as (row order, sorted values) pairs with missing values pre-filled:
+    0 under "min:" and infinity under "max:".
+    Codes and fully-populated whole-number columns use the smallest int dtype.
+    """
+    columns = {}
+    for field in STRING_FILTER_FIELDS:
+        codes, uniques = pd.factorize(frame[field])
+        codes = pd.to_numeric(codes, downcast="integer")
+        columns[field] = (codes, {value: code for code, value in enumerate(uniques)})
+    for column in RANGE_FILTER_FIELDS.values():
+        values = frame[column]
+        if values.notna().all() and (values % 1 == 0).all():
+            # Nothing to fill, so one compact integer array serves both views
+            columns["min:" + column] = columns["max:" + column] = sorted_view(pd.to_numeric(values, downcast="integer").to_numpy())
+            continue
+        values = values.to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        columns["min:" + column] = sorted_view(np.where(missing, 0, values))
+        columns["max:" + column] = sorted_view(np.where(missing, np.inf, values))
+    return columns
+
+def sorted_view(values):
+    """(order, values[order]) so range queries can binary-search the sorted values."""
+    order = np.argsort(values, kind="stable")
+    return order, values[order]
+
+# --- Low-cardinality columns answered from precomputed row bitmaps ---
+BITMAP_FIELDS = ["brokerage", "negotiable"]
+
+def build_filter_bitmaps(frame):
+    """Map (column, value) to a boolean row mask for the bitmap fields and every facility / floor flag."""
+    columns = BITMAP_FIELDS + [c for c in frame.columns if c.startswith(("facility:", "floor:"))]
+    bitmaps = {}
+    for column in columns:
+        values = frame[column]
+        for value in values.dropna().unique():
+            bitmaps[(column, value)] = (values == value).to_numpy()
+    return bitmaps
+
+# --- Dense facility flags for the "has all facilities" filter ---
+def build_facility_matrix(frame):
+    """uint8 matrix with one row per property and one column per facility, plus {facility: column}."""
+    columns = [c for c in frame.columns if c.startswith("facility:")]
+    matrix = np.ascontiguousarray(frame[columns].fillna(0).to_numpy(dtype=np.uint8))
+    return matrix, {c[len("facility:"):]: i for i, c in enumerate(columns)}
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _has_all_facilities(matrix, wanted):
+        out = np.ones(matrix.shape[0], dtype=np.bool_)
+        for i in prange(matrix.shape[0]):
+            for j in wanted:
+                if matrix[i, j] != 1:
+                    out[i] = False
+                    break
+        return out
+
+def facilities_mask(facility_matrix, names):
+    """Boolean mask of rows that have every facility in names set to 1."""
+    matrix, column_of = facility_matrix
+    if any(name not in column_of for name in names):
+        return np.zeros(matrix.shape[0], dtype=bool)  # a facility no property has
+    wanted = np.array([column_of[name] for name in names], dtype=np.int64)
+    if njit is not None:
+        return _has_all_facilities(matrix, wanted)
+    return (matrix[:, wanted] == 1).all(axis=1)
+
+# --- Fields offered as dropdown / multiselect options ---
+OPTION_FIELDS = [
+    "city", "area", "zone", "property_type", "ownership",
+    "possession_status", "location_hub", "floor_no"
+]
+
+def build_filter_options(properties):
+    """Sorted unique values per OPTION_FIELDS field, plus available facilities and floors, in one pass."""
+    values = {field: set() for field in OPTION_FIELDS}
+    facilities, floors = set(), set()
+    for p in properties:
+        for field in OPTION_FIELDS:
+            value = p.get(field)
+            if value:
+                values[field].add(str(value))
+        facilities.update(fac for fac, val in p.get("facilities", {}).items() if val == 1)
+        floors.update(floor for floor, val in p.get("floor_availability", {}).items() if val == 1)
+    options = {field: sorted(found) for field, found in values.items()}
+    options["facilities"] = sorted({fac.replace('_', ' ').title() for fac in facilities})
+    options["floors"] = sorted({floor.replace('_', ' ').title() for floor in floors})
+    return options
+
 # --- Load properties from JSON file ---
 @st.cache_data
 def load_properties():
@@ -29,15 +160,17 @@ def load_properties():
             nagpur_properties = [p for p in properties if 
                               p.get("city", "").lower() == "nagpur" or 
                               p.get("area", "").lower().find("nagpur") != -1]
-            return nagpur_properties
+            frame = build_properties_frame(nagpur_properties)
+            return (nagpur_properties, build_property_columns(frame), build_filter_bitmaps(frame),
+                    build_facility_matrix(frame), build_filter_options(nagpur_properties))
     except FileNotFoundError:
         st.error("Error: 'commercial_data.json' not found. Please ensure the file exists.")
-        return []
+        return [], build_property_columns(build_properties_frame([])), {}, build_facility_matrix(pd.DataFrame()), build_filter_options([])
     except json.JSONDecodeError:
         st.error("Error: Could not decode 'commercial_data.json'. Please check its format.")
-        return []
+        return [], build_property_columns(build_properties_frame([])), {}, build_facility_matrix(pd.DataFrame()), build_filter_options([])
 
-properties_data = load_properties()
+properties_data, properties_columns, properties_bitmaps, properties_facilities, filter_options = load_properties()
 
 # --- Helper for normalization ---
 def normalize_facility_name(facility_name):
@@ -63,8 +196,18 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     r = 6371
     return c * r
 
+def haversine_many(user_lat, user_lon, lats, lons):
+    """Vectorized haversine_distance from one point to arrays of points, in km."""
+    user_lat, user_lon = radians(user_lat), radians(user_lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    dlat = lats - user_lat
+    dlon = lons - user_lon
+    a = np.sin(dlat/2)**2 + np.cos(user_lat) * np.cos(lats) * np.sin(dlon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return c * 6371
+
 # --- Geocoding function to get coordinates from area name in Nagpur ---
-@st.cache_data
+@st.cache_data(ttl=86400, show_spinner=False)
 def geocode_area(area_name):
     """
     Get latitude and longitude for an area name in Nagpur using Nominatim API.
@@ -145,170 +288,65 @@ def format_property(prop, distance=None):
         f"**Available Floors:** {floors_str}"
     )
 
+# --- Helper for bitmap lookups ---
+def row_bitmap(bitmaps, column, value, size):
+    """Precomputed mask of rows where column == value (all False if no row has it)."""
+    found = bitmaps.get((column, value))
+    return found if found is not None else np.zeros(size, dtype=bool)
+
 # --- Function to filter properties by multiple criteria ---
-def filter_properties(data, filters):
-    """Filter properties based on multiple criteria (AND logic)."""
-    filtered = data.copy()
+def filter_properties(data, columns, bitmaps, facility_matrix, filters):
+    """Filter properties based on multiple criteria (AND logic).
+    
+    columns, bitmaps and facility_matrix are the build_property_columns(),
+    build_filter_bitmaps() and build_facility_matrix() views of data;
+    all criteria are combined into one boolean mask.
+    """
+    size = len(data)
+    mask = np.ones(size, dtype=bool)
     
     # Apply each filter separately (AND logic)
     for filter_type, value in filters.items():
-        if filter_type == "city" and value:
-            filtered = [p for p in filtered if p.get("city", "").lower() == value.lower()]
-        
-        elif filter_type == "area" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("area", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("area", "").lower() == value.lower()]
-        
-        elif filter_type == "zone" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("zone", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("zone", "").lower() == value.lower()]
-        
-        elif filter_type == "property_type" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("property_type", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("property_type", "").lower() == value.lower()]
-        
-        elif filter_type == "ownership" and value:
+        if filter_type in BITMAP_FIELDS and value:
             # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("ownership", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("ownership", "").lower() == value.lower()]
+            wanted = value if isinstance(value, list) else [value]
+            mask &= np.logical_or.reduce([row_bitmap(bitmaps, filter_type, v.lower(), size) for v in wanted])
         
-        elif filter_type == "possession_status" and value:
+        elif filter_type in STRING_FILTER_FIELDS and value:
             # Handle both single value and list of values
+            codes, code_of = columns[filter_type]
             if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("possession_status", "").lower() in [v.lower() for v in value]]
+                mask &= np.isin(codes, [code_of.get(v.lower(), -1) for v in value])
             else:
-                filtered = [p for p in filtered if p.get("possession_status", "").lower() == value.lower()]
+                mask &= codes == code_of.get(value.lower(), -1)
         
-        elif filter_type == "location_hub" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("location_hub", "").lower() in [v.lower() for v in value]]
+        elif filter_type.startswith(("min_", "max_")) and filter_type[4:] in RANGE_FILTER_FIELDS and value is not None:
+            column = RANGE_FILTER_FIELDS[filter_type[4:]]
+            # Missing values were filled with 0 for minimums and infinity for maximums
+            if filter_type.startswith("min_"):
+                order, sorted_values = columns["min:" + column]
+                members = order[np.searchsorted(sorted_values, value, side="left"):]
             else:
-                filtered = [p for p in filtered if p.get("location_hub", "").lower() == value.lower()]
-        
-        elif filter_type == "property_id" and value:
-            filtered = [p for p in filtered if p.get("property_id", "").lower() == value.lower()]
-        
-        elif filter_type == "floor_no" and value:
-            # Handle both single value and list of values
-            if isinstance(value, list):
-                filtered = [p for p in filtered if p.get("floor_no", "").lower() in [v.lower() for v in value]]
-            else:
-                filtered = [p for p in filtered if p.get("floor_no", "").lower() == value.lower()]
-        
-        elif filter_type == "min_rent" and value is not None:
-            filtered = [p for p in filtered if p.get("rent_price", 0) >= value]
-        
-        elif filter_type == "max_rent" and value is not None:
-            filtered = [p for p in filtered if p.get("rent_price", float('inf')) <= value]
-        
-        elif filter_type == "min_size" and value is not None:
-            filtered = [p for p in filtered if p.get("size_in_sqft", 0) >= value]
-        
-        elif filter_type == "max_size" and value is not None:
-            filtered = [p for p in filtered if p.get("size_in_sqft", float('inf')) <= value]
-        
-        elif filter_type == "min_carpet_area" and value is not None:
-            filtered = [p for p in filtered if p.get("carpet_area_sqft", 0) >= value]
-        
-        elif filter_type == "max_carpet_area" and value is not None:
-            filtered = [p for p in filtered if p.get("carpet_area_sqft", float('inf')) <= value]
-        
-        elif filter_type == "min_age" and value is not None:
-            filtered = [p for p in filtered if p.get("property_age", 0) >= value]
-        
-        elif filter_type == "max_age" and value is not None:
-            filtered = [p for p in filtered if p.get("property_age", float('inf')) <= value]
-        
-        elif filter_type == "min_security_deposit" and value is not None:
-            filtered = [p for p in filtered if p.get("security_deposit", 0) >= value]
-        
-        elif filter_type == "max_security_deposit" and value is not None:
-            filtered = [p for p in filtered if p.get("security_deposit", float('inf')) <= value]
-        
-        elif filter_type == "min_total_floors" and value is not None:
-            filtered = [p for p in filtered if p.get("total_floors", 0) >= value]
-        
-        elif filter_type == "max_total_floors" and value is not None:
-            filtered = [p for p in filtered if p.get("total_floors", float('inf')) <= value]
-        
-        elif filter_type == "min_lock_in_period" and value is not None:
-            filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", 0) >= value]
-        
-        elif filter_type == "max_lock_in_period" and value is not None:
-            filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", float('inf')) <= value]
+                order, sorted_values = columns["max:" + column]
+                members = order[:np.searchsorted(sorted_values, value, side="right")]
+            in_range = np.zeros(size, dtype=bool)
+            in_range[members] = True
+            mask &= in_range
         
         elif filter_type == "furnishing" and value:
             # value will be either "furnished" or "unfurnished"
             furnishing_value = 1 if value.lower() == "furnished" else 0
-            filtered = [p for p in filtered if p.get("facilities", {}).get("furnishing") == furnishing_value]
-        
-        elif filter_type == "brokerage" and value:
-            filtered = [p for p in filtered if p.get("brokerage", "").lower() == value.lower()]
-        
-        elif filter_type == "negotiable" and value:
-            filtered = [p for p in filtered if p.get("negotiable", "").lower() == value.lower()]
+            mask &= row_bitmap(bitmaps, "facility:furnishing", furnishing_value, size)
         
         elif filter_type == "facilities" and value:
-            # Normalize user facilities
-            user_facilities = [normalize_facility_name(f) for f in value]
-            # Filter properties that have ALL the selected facilities (AND logic)
-            temp_filtered = []
-            for p in filtered:
-                facilities = p.get("facilities", {})
-                # Check if the property has every facility in user_facilities
-                if all(facilities.get(fac) == 1 for fac in user_facilities):
-                    temp_filtered.append(p)
-            filtered = temp_filtered
+            # Keep properties that have ALL the selected facilities (AND logic)
+            mask &= facilities_mask(facility_matrix, [normalize_facility_name(fac) for fac in value])
         
         elif filter_type == "floor" and value:
-            # Normalize user floor selection
-            user_floor = normalize_facility_name(value)
-            # Filter properties that have the selected floor available
-            filtered = [p for p in filtered if p.get("floor_availability", {}).get(user_floor) == 1]
+            # Keep properties that have the selected floor available
+            mask &= row_bitmap(bitmaps, f"floor:{normalize_facility_name(value)}", 1, size)
     
-    return filtered
-
-# --- Function to get unique values for a field ---
-def get_unique_values(data, field):
-    """Get unique values for a specific field from the data."""
-    values = set()
-    for p in data:
-        value = p.get(field)
-        if value:
-            values.add(str(value))
-    return sorted(values)
-
-# --- Function to get all available facilities ---
-def get_all_facilities(data):
-    """Get all facilities that are available in any property."""
-    facilities = set()
-    for p in data:
-        for fac, val in p.get("facilities", {}).items():
-            if val == 1:
-                facilities.add(fac.replace('_', ' ').title())
-    return sorted(facilities)
-
-# --- Function to get all available floors ---
-def get_all_floors(data):
-    """Get all floors that are available in any property."""
-    floors = set()
-    for p in data:
-        for floor, val in p.get("floor_availability", {}).items():
-            if val == 1:
-                floors.add(floor.replace('_', ' ').title())
-    return sorted(floors)
+    return [data[i] for i in np.flatnonzero(mask)]
 
 # --- Function to compare properties side by side ---
 def compare_properties_side_by_side(data, property_ids):
@@ -319,102 +357,111 @@ def compare_properties_side_by_side(data, property_ids):
         st.warning("⚠️ No properties found for the given IDs.")
         return
     
-    # Collect all possible comparison keys
-    comparison_keys = set()
-    for p in selected:
-        comparison_keys.update(p.keys())
-        if isinstance(p.get("facilities"), dict):
-            comparison_keys.update([f"Facility: {k}" for k in p["facilities"].keys()])
-        if isinstance(p.get("floor_availability"), dict):
-            comparison_keys.update([f"Floor: {k}" for k in p["floor_availability"].keys()])
+    # One row per attribute, one column per property; "N/A" where a property lacks the key
+    keys = sorted({k for p in selected for k in p if not k.startswith("_")})
+    top_rows = pd.DataFrame([{**dict.fromkeys(keys, "N/A"), **p} for p in selected], columns=keys).T
     
-    # Always show Property ID and Rent Price first for property comparison
-    display_order = ["property_id", "rent_price"]
-    remaining_keys = sorted(k for k in comparison_keys if k not in display_order)
-    comparison_keys = display_order + remaining_keys
+    def flag_rows(field, prefix):
+        flags = pd.DataFrame([p[field] if isinstance(p.get(field), dict) else {} for p in selected])
+        marks = pd.DataFrame(np.where(flags.eq(1), "✅", "❌"), columns=prefix + flags.columns.astype(str))
+        return marks.T
     
-    # Build rows
-    rows = []
-    for key in comparison_keys:
-        row = [key.replace('_', ' ').title()]
-        for p in selected:
-            value = "N/A"
-            if key.startswith("Facility: "):
-                fname = key.split(": ", 1)[1]
-                value = "✅" if p.get("facilities", {}).get(fname) == 1 else "❌"
-            elif key.startswith("Floor: "):
-                fname = key.split(": ", 1)[1]
-                value = "✅" if p.get("floor_availability", {}).get(fname) == 1 else "❌"
-            else:
-                value = p.get(key, "N/A")
-            
-            # Format some values
-            if key in ["rent_price", "security_deposit"]:
-                value = f"₹{value}" if value != "N/A" else value
-            elif key in ["size_in_sqft", "carpet_area_sqft"]:
-                value = f"{value} sqft" if value != "N/A" else value
-            elif key == "brokerage":
-                value = "Yes" if value == "yes" else "No"
-            
-            row.append(value)
-        rows.append(row)
+    # Format some values
+    for key, fmt in [("rent_price", "₹{}"), ("security_deposit", "₹{}"),
+                     ("size_in_sqft", "{} sqft"), ("carpet_area_sqft", "{} sqft")]:
+        if key in top_rows.index:
+            row = top_rows.loc[key]
+            top_rows.loc[key] = row.where(row == "N/A", row.map(fmt.format))
+    if "brokerage" in top_rows.index:
+        top_rows.loc["brokerage"] = np.where(top_rows.loc["brokerage"] == "yes", "Yes", "No")
     
-    headers = ["Attribute"] + [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+    table = pd.concat([
+        top_rows,
+        flag_rows("facilities", "Facility: "),
+        flag_rows("floor_availability", "Floor: ")
+    ])
+    
+    # Always show Property ID and Rent Price first for property comparison
+    display_order = ["property_id", "rent_price"]
+    comparison_keys = display_order + sorted(k for k in table.index if k not in display_order)
+    table = table.reindex(comparison_keys, fill_value="N/A")
+    table.columns = [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+    table.insert(0, "Attribute", table.index.str.replace('_', ' ').str.title())
     
     # Create a DataFrame for better display
-    df = pd.DataFrame(rows, columns=headers)
+    df = table.reset_index(drop=True)
     st.dataframe(df.style.set_properties(**{'text-align': 'left'}), use_container_width=True)
 
 # --- Function to create property map ---
 def create_property_map(properties, user_location=None):
     """Create a Folium map with property markers for Nagpur."""
-    # Default to Nagpur coordinates
-    nagpur_lat, nagpur_lon = 21.1458, 79.0882
-    
-    # Create a map centered around Nagpur
-    m = folium.Map(location=[nagpur_lat, nagpur_lon], zoom_start=12)
-    
-    # Add tile layer
-    folium.TileLayer('OpenStreetMap').add_to(m)
-    
-    # Add user location marker if provided
-    if user_location:
-        folium.Marker(
-            location=user_location,
-            popup="Your Location",
-            tooltip="You are here",
-            icon=folium.Icon(color='black', icon='user')
-        ).add_to(m)
+    # Geocode each distinct area once for both the distance and marker passes
+    area_coords = {
+        area: geocode_area(area)
+        for area in dict.fromkeys(prop.get("area", "N/A") for prop in properties
+                                  if not ("latitude" in prop and "longitude" in prop))
+    }
     
     # Calculate distances if user location is provided
-    distances = []
     if user_location:
         user_lat, user_lon = user_location
+        located, lats, lons = [], [], []
         for prop in properties:
             # Try to get coordinates from property data
             if "latitude" in prop and "longitude" in prop:
                 prop_lat, prop_lon = prop["latitude"], prop["longitude"]
             else:
-                # Try to geocode the area name within Nagpur
-                coords = geocode_area(prop.get("area", "N/A"))
+                # Use the area's geocoded location within Nagpur
+                coords = area_coords.get(prop.get("area", "N/A"))
                 if coords:
                     prop_lat, prop_lon = coords
                 else:
                     # Skip if we can't get coordinates
                     continue
-            
-            # Calculate distance using Haversine formula
-            distance = haversine_distance(user_lat, user_lon, prop_lat, prop_lon)
-            distances.append(distance)
+            located.append(prop)
+            lats.append(prop_lat)
+            lons.append(prop_lon)
+        
+        # Calculate all distances in one vectorized Haversine pass
+        distances = haversine_many(user_lat, user_lon, np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64))
+        for prop, distance in zip(located, distances.tolist()):
             prop["distance_from_user"] = distance
         
         # Calculate average distance
-        avg_distance = sum(distances) / len(distances) if distances else 0
+        avg_distance = float(distances.mean()) if len(distances) else 0
     else:
         avg_distance = None
     
+    property_ids = tuple(prop.get('property_id', 'N/A') for prop in properties)
+    user_key = tuple(user_location) if user_location else None
+    # The resolved coordinates are part of the key, so areas that failed to geocode get markers once they resolve
+    coords_key = tuple(sorted((str(area), tuple(coords) if coords else None) for area, coords in area_coords.items()))
+    return cached_marker_map(property_ids, user_key, avg_distance, coords_key, properties, area_coords), avg_distance
+
+# --- Folium map for one result set, reused across reruns ---
+@st.cache_resource(max_entries=16, show_spinner=False)
+def cached_marker_map(property_ids, user_location, avg_distance, coords_key, _properties, _area_coords):
+    """Build the marker map once per (property IDs, user location, area coordinates); distances are already on the properties."""
+    # Default to Nagpur coordinates
+    nagpur_lat, nagpur_lon = 21.1458, 79.0882
+    
+    # Create a map centered around Nagpur
+    m = folium.Map(location=[nagpur_lat, nagpur_lon], zoom_start=12)
+    
+    # Add tile layer
+    folium.TileLayer('OpenStreetMap').add_to(m)
+    
+    # Add user location marker if provided
+    if user_location:
+        folium.Marker(
+            location=list(user_location),
+            popup="Your Location",
+            tooltip="You are here",
+            icon=folium.Icon(color='black', icon='user')
+        ).add_to(m)
+    
     # Add property markers
-    for prop in properties:
+    for prop in _properties:
         property_id = prop.get('property_id', 'N/A')
         rent_price = prop.get('rent_price', 'N/A')
         area = prop.get('area', 'N/A')
@@ -425,8 +472,8 @@ def create_property_map(properties, user_location=None):
         if "latitude" in prop and "longitude" in prop:
             lat, lon = prop["latitude"], prop["longitude"]
         else:
-            # Try to geocode the area name within Nagpur
-            coords = geocode_area(area)
+            # Use the area's geocoded location within Nagpur
+            coords = _area_coords.get(area)
             if coords:
                 lat, lon = coords
             else:
@@ -479,7 +526,7 @@ def create_property_map(properties, user_location=None):
         '''
         m.get_root().html.add_child(folium.Element(legend_html))
     
-    return m, avg_distance
+    return m
 
 # --- Main App ---
 def main():
@@ -499,17 +546,17 @@ def main():
     if 'filtered_properties' not in st.session_state:
         st.session_state.filtered_properties = properties_data
     
-    # Get unique values for dropdowns
-    cities = get_unique_values(properties_data, "city")
-    areas = get_unique_values(properties_data, "area")
-    zones = get_unique_values(properties_data, "zone")
-    property_types = get_unique_values(properties_data, "property_type")
-    ownerships = get_unique_values(properties_data, "ownership")
-    possession_statuses = get_unique_values(properties_data, "possession_status")
-    location_hubs = get_unique_values(properties_data, "location_hub")
-    floor_nos = get_unique_values(properties_data, "floor_no")
-    facilities = get_all_facilities(properties_data)
-    floors = get_all_floors(properties_data)
+    # Unique values for dropdowns, computed once by the cached loader
+    cities = filter_options["city"]
+    areas = filter_options["area"]
+    zones = filter_options["zone"]
+    property_types = filter_options["property_type"]
+    ownerships = filter_options["ownership"]
+    possession_statuses = filter_options["possession_status"]
+    location_hubs = filter_options["location_hub"]
+    floor_nos = filter_options["floor_no"]
+    facilities = filter_options["facilities"]
+    floors = filter_options["floors"]
     
     # Sidebar for filters
     st.sidebar.title("🔍 Search Filters")
@@ -836,7 +883,7 @@ def main():
                 
                 # Apply filters
                 st.session_state.filters = filters
-                st.session_state.filtered_properties = filter_properties(properties_data, filters)
+                st.session_state.filtered_properties = filter_properties(properties_data, properties_columns, properties_bitmaps, properties_facilities, filters)
                 st.rerun()
     
     # Compare Properties Mode
@@ -878,7 +925,7 @@ def main():
                     # For comparison mode, we don't filter the properties
                     st.session_state.filtered_properties = properties_data
                 else:
-                    st.session_state.filtered_properties = filter_properties(properties_data, filters)
+                    st.session_state.filtered_properties = filter_properties(properties_data, properties_columns, properties_bitmaps, properties_facilities, filters)
         with col2:
             if st.sidebar.button("Reset Filters"):
                 st.session_state.filters = {}
@@ -1020,7 +1067,8 @@ def main():
                             color="property_type",
                             hover_name="listing_title",
                             labels={"size_in_sqft": "Size (sqft)", "rent_price": "Rent (₹)"},
-                            title="Size vs Rent by Property Type"
+                            title="Size vs Rent by Property Type",
+                            render_mode="webgl"
                         )
                         st.plotly_chart(fig_scatter, use_container_width=True)
                         
@@ -1,53 +1,125 @@
 import json
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 import folium
 from folium import plugins
 from streamlit_folium import folium_static
 import plotly.express as px
+import plotly.io as pio
 import random
 from branca.element import Element
 
-# --- Load JSON data ---
+# simdjson is optional; only used once pg.json grows past LARGE_JSON_BYTES
 try:
-    with open("pg.json", "r") as f:
-        pg_data = json.load(f)
-    df = pd.DataFrame(pg_data)
-except FileNotFoundError:
-    st.error("pg.json file not found. Please ensure the file exists.")
-    st.stop()
-except Exception as e:
-    st.error(f"Error loading data: {str(e)}")
-    st.stop()
+    import simdjson
+except ImportError:
+    simdjson = None
 
-# --- Fix Amenities and Common Area columns safely ---
-if "Amenities" in df:
-    df["Amenities"] = df["Amenities"].apply(lambda x: x if isinstance(x, list) else [])
-else:
-    df["Amenities"] = [[] for _ in range(len(df))]
+LARGE_JSON_BYTES = 10 * 1024 * 1024
 
-if "Common Area" in df:
-    df["Common Area"] = df["Common Area"].apply(lambda x: x if isinstance(x, list) else [])
-else:
-    df["Common Area"] = [[] for _ in range(len(df))]
+# pyarrow is optional; when present the cleaned frame is cached as a Parquet sidecar
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+PG_JSON_PATH = "pg.json"
+PG_PARQUET_PATH = "pg.parquet"
+
+# --- Tag HTML helpers ---
+_TAG_FMT = "<span class='amenity-tag'>%s</span>"
+
+def tags_html(items):
+    if not items:
+        return ""
+    return "<div class='amenities'>" + "".join(map(_TAG_FMT.__mod__, items)) + "</div>"
 
-# --- Ensure required columns exist ---
+# --- Columns the dashboard relies on ---
 required_columns = [
     "Listing Title", "City", "Area", "Zone", "PG Name", "Shearing", 
     "Best Suit For", "Meals Available", "Notice Period", "Lock-in Period",
     "Non-Veg Allowed", "Opposite Gender Allowed", "Visitors Allowed",
     "Drinking Allowed", "Smoking Allowed", "Rent Price", "Security Deposit"
 ]
+numeric_columns = ["Rent Price", "Security Deposit"]
+categorical_columns = ["Shearing", "Meals Available", "Opposite Gender Allowed"]
+keep_columns = required_columns + ["Amenities", "Common Area"]
 
-for col in required_columns:
-    if col not in df.columns:
-        df[col] = "" if col != "Rent Price" else 0
+LISTINGS_PAGE_SIZE = 25
 
+# --- Load JSON data ---
+def read_pg_records(path):
+    if simdjson is not None and os.path.getsize(path) > LARGE_JSON_BYTES:
+        with open(path, "rb") as f:
+            return simdjson.Parser().parse(f.read()).as_list()
+    with open(path, "r") as f:
+        return json.load(f)
+
+def sidecar_is_fresh():
+    return (os.path.exists(PG_PARQUET_PATH)
+            and os.path.getmtime(PG_PARQUET_PATH) >= os.path.getmtime(PG_JSON_PATH))
+
+def read_pg_sidecar():
+    df = pd.read_parquet(PG_PARQUET_PATH)
+    # Parquet hands list columns back as arrays
+    for col in ["Amenities", "Common Area"]:
+        df[col] = df[col].map(list)
+    return df
 
+# Cached as a shared resource so reruns skip hashing/copying the whole
+# frame; callers must treat it as read-only and derive filtered copies
+@st.cache_resource
+def load_pg_data():
+    if pyarrow is not None and sidecar_is_fresh():
+        return read_pg_sidecar()
 
+    df = pd.DataFrame(read_pg_records(PG_JSON_PATH))
 
+    # --- Fix Amenities and Common Area columns safely ---
+    if "Amenities" in df:
+        df["Amenities"] = [x if isinstance(x, list) else [] for x in df["Amenities"].to_numpy()]
+    else:
+        df["Amenities"] = [[] for _ in range(len(df))]
 
+    if "Common Area" in df:
+        df["Common Area"] = [x if isinstance(x, list) else [] for x in df["Common Area"].to_numpy()]
+    else:
+        df["Common Area"] = [[] for _ in range(len(df))]
+
+    # --- Ensure required columns exist ---
+    for col in required_columns:
+        if col not in df.columns:
+            df[col] = 0 if col in numeric_columns else ""
+
+    # --- Drop unused fields and keep money columns compact ---
+    df = df[keep_columns].copy()
+    for col in numeric_columns:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int32")
+    for col in categorical_columns:
+        df[col] = df[col].astype("category")
+
+    # --- Precompute tag HTML once instead of per rerun ---
+    df["_amenities_html"] = df["Amenities"].map(tags_html)
+    df["_common_area_html"] = df["Common Area"].map(tags_html)
+
+    # --- Write the cleaned frame next to pg.json for warm starts ---
+    if pyarrow is not None:
+        try:
+            df.to_parquet(PG_PARQUET_PATH, compression="zstd")
+        except OSError:
+            pass
+    return df
 
+try:
+    df = load_pg_data()
+except FileNotFoundError:
+    st.error("pg.json file not found. Please ensure the file exists.")
+    st.stop()
+except Exception as e:
+    st.error(f"Error loading data: {str(e)}")
+    st.stop()
 
 # --- Page Configuration ---
 st.set_page_config(page_title="PG Finder Dashboard", layout="wide", initial_sidebar_state="expanded")
@@ -119,35 +191,34 @@ smoking = st.sidebar.selectbox("Smoking Allowed", options=["Any", "Yes", "No"])
 rent_max = st.sidebar.number_input("Max Rent", min_value=0, value=int(df["Rent Price"].max()))
 
 # --- Apply Filters ---
-filtered_df = df.copy()
-
-def filter_dropdown(df, column, value):
+equality_filters = {
+    "Listing Title": listing_title,
+    "City": city,
+    "Area": area,
+    "Zone": zone,
+    "PG Name": pg_name,
+    "Shearing": shearing,
+    "Best Suit For": best_suit_for,
+    "Meals Available": meals,
+    "Notice Period": notice_period,
+    "Lock-in Period": lock_in_period,
+    "Non-Veg Allowed": non_veg,
+    "Opposite Gender Allowed": opposite_gender,
+    "Visitors Allowed": visitors,
+    "Drinking Allowed": drinking,
+    "Smoking Allowed": smoking,
+}
+
+# Compose only the active predicates into one expression so pandas
+# (numexpr when installed) evaluates them in a single pass
+predicates = ["`Rent Price` <= @rent_max"]
+query_params = {"rent_max": rent_max}
+for i, (column, value) in enumerate(equality_filters.items()):
     if value != "Any":
-        return df[df[column] == value]
-    return df
+        predicates.append(f"`{column}` == @value_{i}")
+        query_params[f"value_{i}"] = value
 
-filtered_df = filter_dropdown(filtered_df, "Listing Title", listing_title)
-filtered_df = filter_dropdown(filtered_df, "City", city)
-filtered_df = filter_dropdown(filtered_df, "Area", area)
-filtered_df = filter_dropdown(filtered_df, "Zone", zone)
-filtered_df = filter_dropdown(filtered_df, "PG Name", pg_name)
-filtered_df = filter_dropdown(filtered_df, "Shearing", shearing)
-filtered_df = filter_dropdown(filtered_df, "Best Suit For", best_suit_for)
-if meals != "Any":
-    filtered_df = filtered_df[filtered_df["Meals Available"] == meals]
-filtered_df = filter_dropdown(filtered_df, "Notice Period", notice_period)
-filtered_df = filter_dropdown(filtered_df, "Lock-in Period", lock_in_period)
-if non_veg != "Any":
-    filtered_df = filtered_df[filtered_df["Non-Veg Allowed"] == non_veg]
-if opposite_gender != "Any":
-    filtered_df = filtered_df[filtered_df["Opposite Gender Allowed"] == opposite_gender]
-if visitors != "Any":
-    filtered_df = filtered_df[filtered_df["Visitors Allowed"] == visitors]
-if drinking != "Any":
-    filtered_df = filtered_df[filtered_df["Drinking Allowed"] == drinking]
-if smoking != "Any":
-    filtered_df = filtered_df[filtered_df["Smoking Allowed"] == smoking]
-filtered_df = filtered_df[filtered_df["Rent Price"] <= rent_max]
+filtered_df = df.query(" and ".join(predicates), local_dict=query_params)
 
 # --- Results Header ---
 st.markdown(f"### 🏠 Found {len(filtered_df)} PG Listings matching your criteria")
@@ -156,29 +227,27 @@ st.markdown(f"### 🏠 Found {len(filtered_df)} PG Listings matching your criter
 avg_rent = filtered_df["Rent Price"].mean() if not filtered_df.empty else 0
 st.markdown(f"#### 💰 Average Rent: ₹{avg_rent:.2f}")
 
+# --- Above/below average flags, computed once for the whole result ---
+above_avg = filtered_df["Rent Price"].to_numpy() > avg_rent
+marker_colors = np.where(above_avg, "red", "blue")
+rent_labels = np.where(above_avg, "<span style='color:red;'>Above Average</span>", "<span style='color:blue;'>Below Average</span>")
+
 # --- PG Listings ---
 st.markdown("### 📋 PG Listings")
 
 if filtered_df.empty:
     st.warning("No PG listings match your criteria. Please adjust your filters.")
 else:
-    for idx, row in filtered_df.iterrows():
-        rent_class = "avg-rent-highlight" if row['Rent Price'] > avg_rent else "below-avg-rent"
+    # Render one page of expanders at a time
+    max_pages = (len(filtered_df) - 1) // LISTINGS_PAGE_SIZE + 1
+    if st.session_state.get("pg_page", 1) > max_pages:
+        st.session_state["pg_page"] = 1
+    page = st.number_input("Page", min_value=1, max_value=max_pages, step=1, key="pg_page")
+    st.caption(f"Showing page {page} of {max_pages}")
+    page_df = filtered_df.iloc[(page - 1) * LISTINGS_PAGE_SIZE: page * LISTINGS_PAGE_SIZE]
+
+    for idx, row in page_df.iterrows():
         with st.expander(f"**{row['PG Name']}** - {row['Shearing']} | ₹{row['Rent Price']}", expanded=False):
-            # Create amenities display
-            amenities_html = ""
-            if row['Amenities']:
-                amenities_html = "<div class='amenities'>" + \
-                                "".join([f"<span class='amenity-tag'>{amenity}</span>" for amenity in row['Amenities']]) + \
-                                "</div>"
-
-            # Create common area display
-            common_area_html = ""
-            if row['Common Area']:
-                common_area_html = "<div class='amenities'>" + \
-                                  "".join([f"<span class='amenity-tag'>{area}</span>" for area in row['Common Area']]) + \
-                                  "</div>"
-
             st.markdown(f"""
             <div class="pg-details">
                 <div class="detail-row"><span class="detail-label">Listing Title:</span><span class="detail-value">{row['Listing Title']}</span></div>
@@ -194,9 +263,9 @@ else:
                 <div class="detail-row"><span class="detail-label">Smoking Allowed:</span><span class="detail-value">{row['Smoking Allowed']}</span></div>
                 <div class="detail-row"><span class="detail-label">Security Deposit:</span><span class="detail-value">₹{row['Security Deposit']}</span></div>
                 <div class="detail-row"><span class="detail-label">Amenities:</span></div>
-                {amenities_html}
+                {row['_amenities_html']}
                 <div class="detail-row"><span class="detail-label">Common Area:</span></div>
-                {common_area_html}
+                {row['_common_area_html']}
             </div>
             """, unsafe_allow_html=True)
 
@@ -208,33 +277,20 @@ filtered_df.loc[:, "Longitude"] = filtered_df.index.map(lambda x: 79.0882 + rand
 m = folium.Map(location=[21.1458, 79.0882], zoom_start=12)
 
 # Add markers with color coding based on rent
-for idx, row in filtered_df.iterrows():
-    # Determine marker color based on rent
-    if row['Rent Price'] > avg_rent:
-        color = 'red'
-        icon_color = 'white'
-    else:
-        color = 'blue'
-        icon_color = 'white'
-    
+for (idx, row), color, rent_label in zip(filtered_df.iterrows(), marker_colors, rent_labels):
     # Create popup with rent comparison
     popup_html = f"""
     <b>{row['PG Name']}</b><br>
     Shearing: {row['Shearing']}<br>
     Rent: <b>₹{row['Rent Price']}</b><br>
     Average: <b>₹{avg_rent:.2f}</b><br>
-    """
-    
-    if row['Rent Price'] > avg_rent:
-        popup_html += "<span style='color:red;'>Above Average</span>"
-    else:
-        popup_html += "<span style='color:blue;'>Below Average</span>"
+    {rent_label}"""
     
     folium.Marker(
         location=[row["Latitude"], row["Longitude"]],
         popup=folium.Popup(popup_html, max_width=250),
         tooltip=row["Area"],
-        icon=folium.Icon(color=color, icon_color=icon_color, icon='home')
+        icon=folium.Icon(color=str(color), icon_color='white', icon='home')
     ).add_to(m)
 
 # Add a legend to the map
@@ -255,6 +311,36 @@ m.get_root().html.add_child(Element(legend_html))
 folium_static(m, width=700, height=500)
 
 # --- Analytics Section ---
+def category_counts(series, label):
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    present = counts > 0
+    return pd.DataFrame({label: series.cat.categories[present], "Count": counts[present]})
+
+# Figures are cached as Plotly JSON keyed on the plotted values, so an
+# unchanged filter result skips figure construction and validation
+@st.cache_data
+def avg_rent_bar_json(areas, rents):
+    avg_rent_area = pd.DataFrame({"Area": areas, "Rent Price": rents})
+    fig = px.bar(avg_rent_area, x="Area", y="Rent Price", title="Average Rent by Area", color="Rent Price", color_continuous_scale="Blues")
+    fig.update_layout(title_font_size=18, xaxis_title="Area", yaxis_title="Average Rent (₹)", plot_bgcolor='rgba(0,0,0,0)')
+    return fig.to_json()
+
+@st.cache_data
+def shearing_pie_json(names, counts):
+    shearing_count = pd.DataFrame({"Shearing": names, "Count": counts})
+    fig = px.pie(shearing_count, names="Shearing", values="Count", title="Shearing Type Distribution", hole=0.4)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(title_font_size=18)
+    return fig.to_json()
+
+@st.cache_data
+def count_bar_json(label, names, counts, title, xaxis_title, color_map):
+    count_df = pd.DataFrame({label: names, "Count": counts})
+    fig = px.bar(count_df, x=label, y="Count", title=title, color=label, color_discrete_map=color_map)
+    fig.update_layout(title_font_size=18, xaxis_title=xaxis_title, yaxis_title="Count", plot_bgcolor='rgba(0,0,0,0)')
+    return fig.to_json()
+
 st.markdown("### 📊 Analytics")
 
 if filtered_df.empty:
@@ -266,9 +352,8 @@ else:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if "Area" in filtered_df.columns:
             avg_rent_area = filtered_df.groupby("Area")["Rent Price"].mean().reset_index()
-            fig1 = px.bar(avg_rent_area, x="Area", y="Rent Price", title="Average Rent by Area", color="Rent Price", color_continuous_scale="Blues")
-            fig1.update_layout(title_font_size=18, xaxis_title="Area", yaxis_title="Average Rent (₹)", plot_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig1, use_container_width=True)
+            fig1 = avg_rent_bar_json(tuple(avg_rent_area["Area"]), tuple(avg_rent_area["Rent Price"]))
+            st.plotly_chart(pio.from_json(fig1), use_container_width=True)
         else:
             st.warning("Area data not available for this chart.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -276,12 +361,9 @@ else:
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if "Shearing" in filtered_df.columns:
-            shearing_count = filtered_df["Shearing"].value_counts().reset_index()
-            shearing_count.columns = ["Shearing", "Count"]
-            fig2 = px.pie(shearing_count, names="Shearing", values="Count", title="Shearing Type Distribution", hole=0.4)
-            fig2.update_traces(textposition='inside', textinfo='percent+label')
-            fig2.update_layout(title_font_size=18)
-            st.plotly_chart(fig2, use_container_width=True)
+            shearing_count = category_counts(filtered_df["Shearing"], "Shearing")
+            fig2 = shearing_pie_json(tuple(shearing_count["Shearing"]), tuple(shearing_count["Count"]))
+            st.plotly_chart(pio.from_json(fig2), use_container_width=True)
         else:
             st.warning("Shearing data not available for this chart.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -291,11 +373,10 @@ else:
     with col3:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if "Meals Available" in filtered_df.columns:
-            meals_count = filtered_df["Meals Available"].value_counts().reset_index()
-            meals_count.columns = ["Meals", "Count"]
-            fig3 = px.bar(meals_count, x="Meals", y="Count", title="Meals Availability", color="Meals", color_discrete_map={"Yes": "#4ade80", "No": "#f87171"})
-            fig3.update_layout(title_font_size=18, xaxis_title="Meals Available", yaxis_title="Count", plot_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig3, use_container_width=True)
+            meals_count = category_counts(filtered_df["Meals Available"], "Meals")
+            fig3 = count_bar_json("Meals", tuple(meals_count["Meals"]), tuple(meals_count["Count"]),
+                                  "Meals Availability", "Meals Available", {"Yes": "#4ade80", "No": "#f87171"})
+            st.plotly_chart(pio.from_json(fig3), use_container_width=True)
         else:
             st.warning("Meals data not available for this chart.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -303,11 +384,10 @@ else:
     with col4:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if "Opposite Gender Allowed" in filtered_df.columns:
-            gender_count = filtered_df["Opposite Gender Allowed"].value_counts().reset_index()
-            gender_count.columns = ["Policy", "Count"]
-            fig4 = px.bar(gender_count, x="Policy", y="Count", title="Opposite Gender Policy", color="Policy", color_discrete_map={"Yes": "#60a5fa", "No": "#fbbf24"})
-            fig4.update_layout(title_font_size=18, xaxis_title="Opposite Gender Allowed", yaxis_title="Count", plot_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig4, use_container_width=True)
+            gender_count = category_counts(filtered_df["Opposite Gender Allowed"], "Policy")
+            fig4 = count_bar_json("Policy", tuple(gender_count["Policy"]), tuple(gender_count["Count"]),
+                                  "Opposite Gender Policy", "Opposite Gender Allowed", {"Yes": "#60a5fa", "No": "#fbbf24"})
+            st.plotly_chart(pio.from_json(fig4), use_container_width=True)
         else:
             st.warning("Opposite Gender policy data not available for this chart.")
         st.markdown('</div>', unsafe_allow_html=True)
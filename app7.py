@@ -1,15 +1,15 @@
 import streamlit as st
 import json
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import folium_static
+import numpy as np
 from collections import defaultdict
 import re
 import math
+import functools
 from math import radians, sin, cos, sqrt, atan2
-import requests
+import shelve
+import threading
+import time
 
 # Set page configuration
 st.set_page_config(
@@ -28,7 +28,47 @@ app_mode = st.sidebar.radio(
     ["Residential Properties", "Commercial Properties", "PG Finder"]
 )
 
+# orjson is optional; it parses the listing files several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numba is optional; when present the distance kernel is compiled and run across cores
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Common functions used by all apps
+def load_json_file(path):
+    """Parse a JSON file, preferring orjson when it is installed.
+    
+    Falls back to json for files orjson rejects, such as ones containing NaN.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+_NUM_RE = re.compile(r"\d+")  # first run of digits in a filter value
+_ID_SPLIT_RE = re.compile(r"\s*,\s*")  # comma plus surrounding whitespace in a property ID list
+
+# Memoized on the value's text at module level, so the cache survives reruns and any value type works
+@functools.lru_cache(maxsize=4096)
+def _first_number(text):
+    match = _NUM_RE.search(text)
+    return int(match.group()) if match else None
+
+def get_numeric_value(value):
+    if not value:
+        return None
+    return _first_number(str(value))
+
 def haversine_distance(lat1, lon1, lat2, lon2):
     """Calculate the great circle distance between two points on earth."""
     lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
@@ -39,20 +79,138 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     r = 6371  # Radius of earth in kilometers
     return c * r
 
+def haversine_many(user_lat, user_lon, lats, lons):
+    """Vectorized haversine_distance from one point to arrays of points, in km."""
+    if njit is not None:
+        return _haversine_kernel(radians(user_lat), radians(user_lon), np.radians(lats), np.radians(lons))
+    user_lat, user_lon = radians(user_lat), radians(user_lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    dlat = lats - user_lat
+    dlon = lons - user_lon
+    a = np.sin(dlat/2)**2 + np.cos(user_lat) * np.cos(lats) * np.sin(dlon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return c * 6371
+
+if njit is not None:
+    # cache=True keeps the compiled kernel on disk, since Streamlit re-executes this module on every rerun
+    @njit(parallel=True, cache=True)
+    def _haversine_kernel(user_lat, user_lon, lats, lons):
+        out = np.empty_like(lats)
+        for i in prange(lats.shape[0]):
+            a = math.sin((lats[i] - user_lat)/2)**2 + math.cos(user_lat) * math.cos(lats[i]) * math.sin((lons[i] - user_lon)/2)**2
+            out[i] = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a)) * 6371
+        return out
+
+def histogram_figure(values, nbins, title, x_label):
+    """Histogram as a bar chart of nbins equal-width bins counted here, so only the counts reach the browser."""
+    import plotly.express as px
+    values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
+    low, high = (values.min(), values.max()) if len(values) else (0.0, 0.0)
+    width = (high - low) / nbins or 1.0
+    counts = np.bincount(np.clip(((values - low) / width).astype(np.int64), 0, nbins - 1), minlength=nbins)
+    fig = px.bar(
+        x=low + width * (np.arange(nbins) + 0.5),
+        y=counts,
+        labels={"x": x_label, "y": "Number of Properties"},
+        title=title
+    )
+    fig.update_traces(width=width)
+    fig.update_layout(bargap=0)
+    return fig
+
+def density_figure(x_values, y_values, nbins, title, x_label, y_label):
+    """2D histogram of nbins x nbins cells counted here, so only the cell counts reach the browser."""
+    import plotly.express as px
+    x_values = pd.to_numeric(x_values, errors="coerce").to_numpy(dtype=np.float64)
+    y_values = pd.to_numeric(y_values, errors="coerce").to_numpy(dtype=np.float64)
+    both = ~(np.isnan(x_values) | np.isnan(y_values))
+    counts, x_edges, y_edges = np.histogram2d(x_values[both], y_values[both], bins=nbins)
+    fig = px.imshow(
+        counts.T,
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        origin="lower",
+        aspect="auto",
+        labels={"x": x_label, "y": y_label, "color": "Number of Properties"},
+        title=title
+    )
+    return fig
+
+# Geocoding results persist on disk across sessions and restarts
+GEOCODE_CACHE_PATH = ".geocode_cache"
+GEOCODE_TTL = 30 * 86400  # seconds to keep a found location
+GEOCODE_MISS_TTL = 86400  # seconds to remember an area Nominatim could not find
+
+# One keep-alive connection to Nominatim, paced to its one-request-per-second policy
+NOMINATIM_MIN_INTERVAL = 1.0  # seconds between requests
+
+@st.cache_resource
+def nominatim_client():
+    """Session and rate-limit state shared by every rerun and browser session."""
+    import requests
+    session = requests.Session()
+    session.headers["User-Agent"] = "PropertySearchApp/1.0"
+    return {"session": session, "lock": threading.Lock(), "last_request": 0.0}
+
+def nominatim_get(url):
+    """GET a Nominatim URL over the shared session, waiting out the rate limit first."""
+    client = nominatim_client()
+    with client["lock"]:
+        wait = client["last_request"] + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        client["last_request"] = time.monotonic()
+    return client["session"].get(url, timeout=5)
+
+# In-process copy of the disk cache, so repeat lookups skip opening the shelve file
+@st.cache_resource(ttl=GEOCODE_MISS_TTL)
+def geocode_memory_cache():
+    """Shared {area key: (coords, expiry)} dict plus the lock guarding it and the shelve file."""
+    return {}, threading.Lock()
+
+# Popup body shared by the residential and commercial property markers
+MARKER_POPUP_TEMPLATE = (
+    "<b>ID:</b> {property_id}<br>"
+    "<b>Rent:</b> ₹{rent}<br>"
+    "<b>Area:</b> {area}<br>"
+    "<b>Size:</b> {size} sqft<br>"
+    "<b>Type:</b> {property_type}<br>"
+    "{distance_text}"
+)
+
 def geocode_area(area_name):
     """Get latitude and longitude for an area name in Nagpur."""
+    key = str(area_name).replace(" ", "").lower()
+    memory, lock = geocode_memory_cache()
+    entry = memory.get(key)
+    if entry is None:
+        with lock, shelve.open(GEOCODE_CACHE_PATH) as cache:
+            entry = cache.get(key)
+        if entry is not None:
+            memory[key] = entry
+    if entry is not None and entry[1] > time.time():
+        return entry[0]
+    
     try:
         url = f"https://nominatim.openstreetmap.org/search?q={area_name}, Nagpur, India&format=json&limit=1"
-        headers = {"User-Agent": "PropertySearchApp/1.0"}
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                return float(data[0]["lat"]), float(data[0]["lon"])
-        return None
+        response = nominatim_get(url)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        if data:
+            coords, ttl = (float(data[0]["lat"]), float(data[0]["lon"])), GEOCODE_TTL
+        else:
+            coords, ttl = None, GEOCODE_MISS_TTL
     except Exception as e:
         st.warning(f"Geocoding error for {area_name}: {str(e)}")
         return None
+    
+    entry = (coords, time.time() + ttl)
+    with lock, shelve.open(GEOCODE_CACHE_PATH) as cache:
+        cache[key] = entry
+    memory[key] = entry
+    return coords
 
 # App 1: Residential Property Search
 def run_residential_app():
@@ -67,70 +225,122 @@ def run_residential_app():
     if 'residential_user_location' not in st.session_state:
         st.session_state.residential_user_location = None
     
-    # Load properties from JSON file
-    @st.cache_data
-    def load_properties():
-        try:
-            with open("property_data.json", "r") as f:
-                properties = json.load(f)
-                nagpur_properties = [p for p in properties if p.get("City", "").lower() == "nagpur" or p.get("Area", "").lower().find("nagpur") != -1]
-                return nagpur_properties
-        except FileNotFoundError:
-            st.error("Error: 'property_data.json' not found. Please ensure the file exists.")
-            return []
-        except json.JSONDecodeError:
-            st.error("Error: Could not decode 'property_data.json'. Please check its format.")
-            return []
-    
-    properties_data = load_properties()
-    
-    # Helper functions for normalization
+    # Helper functions for normalization (no strip() needed once every space is replaced)
     def normalize_area_name(area_name):
-        return str(area_name).replace(" ", "").lower().strip()
+        return str(area_name).replace(" ", "").lower()
     
     def normalize_zone_name(zone_name):
-        return str(zone_name).replace(" ", "").lower().strip()
+        return str(zone_name).replace(" ", "").lower()
     
     def normalize_facility_name(facility_name):
-        return str(facility_name).replace(" ", "_").lower().strip()
+        return str(facility_name).replace(" ", "_").lower()
     
     def normalize_amenity_name(name):
-        return str(name).replace(" ", "_").lower().strip()
+        return str(name).replace(" ", "_").lower()
     
     def normalize_room_name(room_name):
-        return str(room_name).replace(" ", "").lower().strip()
+        return str(room_name).replace(" ", "").lower()
     
     def normalize_property_type_name(prop_type):
         return str(prop_type).lower().strip()
     
-    def get_numeric_value(value):
-        if not value:
+    def normalized_flags(flags, normalize):
+        """Normalized names of the flags set to 1, or None when flags is not a dict."""
+        if not isinstance(flags, dict):
             return None
-        match = re.search(r"\d+", str(value))
-        return int(match.group()) if match else None
+        normalized = {normalize(k): v for k, v in flags.items()}
+        return frozenset(k for k, v in normalized.items() if v == 1)
+    
+    def flag_bits(flag_sets):
+        """Give every flag name found in flag_sets its own bit."""
+        names = sorted(set().union(*(flags for flags in flag_sets if flags is not None)))
+        return {name: 1 << i for i, name in enumerate(names)}
+    
+    def flags_mask(flags, bits):
+        """OR together the bits of flags, or None when flags is None (unknown names give None too)."""
+        if flags is None or any(name not in bits for name in flags):
+            return None
+        return sum(bits[name] for name in flags)  # distinct bits, so the sum is their OR
+    
+    # Key functions for the exact-match fields served by inverted indexes
+    INDEX_KEY_FUNCS = {
+        "brokerage": lambda p: str(p.get("Brokerage", "N/A")).lower(),
+        "furnishing": lambda p: str(p.get("Furnishing_Status", "N/A")).lower(),
+        "maintenance": lambda p: str(p.get("Maintenance_Charge", "N/A")).lower(),
+        "recommended_for": lambda p: str(p.get("Recommended_For", "N/A")).lower(),
+        "water_supply": lambda p: str(p.get("Water_Supply_Type", "N/A")).lower(),
+        "society_type": lambda p: str(p.get("Society_Type", "N/A")).lower(),
+        "area": lambda p: normalize_area_name(p.get("Area", "N/A")),
+        "zone": lambda p: normalize_zone_name(p.get("Zone", "N/A")),
+        "room_type": lambda p: normalize_room_name(p.get("Room_Details", {}).get("Rooms", "")),
+        "property_type": lambda p: normalize_property_type_name(p.get("Room_Details", {}).get("Type", "")),
+        "id": lambda p: str(p.get("property_id", "")).lower()
+    }
+    
+    def build_indexes(properties):
+        """Map each indexed field to {normalized value: [properties]} in data order."""
+        indexes = {field: defaultdict(list) for field in INDEX_KEY_FUNCS}
+        for p in properties:
+            for field, key_func in INDEX_KEY_FUNCS.items():
+                indexes[field][key_func(p)].append(p)
+        return {field: dict(index) for field, index in indexes.items()}
+    
+    # Load properties from JSON file
+    @st.cache_data
+    def load_properties():
+        try:
+            properties = load_json_file("property_data.json")
+            nagpur_properties = [p for p in properties if p.get("City", "").lower() == "nagpur" or p.get("Area", "").lower().find("nagpur") != -1]
+            # Pack the available facilities / nearby amenities into one bitmask per property
+            facility_sets = [normalized_flags(p.get("Facilities"), normalize_facility_name) for p in nagpur_properties]
+            amenity_sets = [normalized_flags(p.get("Nearby_Amenities"), normalize_amenity_name) for p in nagpur_properties]
+            bits = {"facilities": flag_bits(facility_sets), "nearby_amenities": flag_bits(amenity_sets)}
+            for p, facility_set, amenity_set in zip(nagpur_properties, facility_sets, amenity_sets):
+                p["_facilities_mask"] = flags_mask(facility_set, bits["facilities"])
+                p["_amenities_mask"] = flags_mask(amenity_set, bits["nearby_amenities"])
+            # Returned together so the index lists share the same property dicts
+            return nagpur_properties, build_indexes(nagpur_properties), bits
+        except FileNotFoundError:
+            st.error("Error: 'property_data.json' not found. Please ensure the file exists.")
+            return [], build_indexes([]), {"facilities": {}, "nearby_amenities": {}}
+        except json.JSONDecodeError:
+            st.error("Error: Could not decode 'property_data.json'. Please check its format.")
+            return [], build_indexes([]), {"facilities": {}, "nearby_amenities": {}}
+    
+    properties_data, property_indexes, property_flag_bits = load_properties()
     
     # Dynamically get all unique values from the dataset
-    ALL_AREAS = sorted(list(set(normalize_area_name(p.get("Area", "N/A")) for p in properties_data)))
-    ALL_ZONES = sorted(list(set(normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data)))
+    ALL_AREAS = sorted({normalize_area_name(p.get("Area", "N/A")) for p in properties_data})
+    ALL_ZONES = sorted({normalize_zone_name(p.get("Zone", "N/A")) for p in properties_data})
     
     ALL_FACILITIES = []
     for p in properties_data:
         if "Facilities" in p and isinstance(p["Facilities"], dict):
-            ALL_FACILITIES = sorted(list(p["Facilities"].keys()))
+            ALL_FACILITIES = sorted(p["Facilities"])
             break
     
     ALL_NEARBY_AMENITIES = []
     for p in properties_data:
         if "Nearby_Amenities" in p and isinstance(p["Nearby_Amenities"], dict):
-            ALL_NEARBY_AMENITIES = sorted(list(p["Nearby_Amenities"].keys()))
+            ALL_NEARBY_AMENITIES = sorted(p["Nearby_Amenities"])
             break
     
-    ALL_ROOM_TYPES = sorted(list(set(normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A")) for p in properties_data if p.get("Room_Details", {}).get("Rooms"))))
-    ALL_PROPERTY_TYPES = sorted(list(set(normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A")) for p in properties_data if p.get("Room_Details", {}).get("Type"))))
+    ALL_ROOM_TYPES = sorted({normalize_room_name(p.get("Room_Details", {}).get("Rooms", "N/A")) for p in properties_data if p.get("Room_Details", {}).get("Rooms")})
+    ALL_PROPERTY_TYPES = sorted({normalize_property_type_name(p.get("Room_Details", {}).get("Type", "N/A")) for p in properties_data if p.get("Room_Details", {}).get("Type")})
+    
+    # Normalized index keys for a user's exact-match filter value
+    def index_query_keys(field, user_input):
+        if field == "id":
+            return _ID_SPLIT_RE.split(user_input.strip().lower())
+        if field == "area":
+            return [normalize_area_name(user_input)]
+        if field == "zone":
+            return [normalize_zone_name(user_input)]
+        return [user_input.lower().strip()]
     
     # Filtering logic
-    def filter_properties(user_input, field, data):
-        filtered_properties = []
+    def field_predicate(user_input, field):
+        """Test a property against one filter; None when no property can match."""
         data_field_map = {
             "size": "Size_In_Sqft", "carpet": "Carpet_Area_Sqft", "age": "Property_Age", "brokerage": "Brokerage",
             "furnishing": "Furnishing_Status", "amenities": "Number_Of_Amenities", "security": "Security_Deposite", "rent": "Rent_Price",
@@ -142,108 +352,76 @@ def run_residential_app():
         }
         data_field = data_field_map.get(field)
         if not data_field:
-            return []
-    
-        normalized_user_input = user_input.lower().strip()
+            return None
         
-        # String fields
-        if field in ["brokerage", "furnishing", "maintenance", "recommended_for", "water_supply", "society_type"]:
-            filtered_properties = [p for p in data if str(p.get(data_field, "N/A")).lower() == normalized_user_input]
+        # Exact-match fields are answered from the inverted indexes
+        if field in property_indexes:
+            index = property_indexes[field]
+            hit_ids = {id(p) for key in index_query_keys(field, user_input) for p in index.get(key, [])}
+            return (lambda p: id(p) in hit_ids) if hit_ids else None
         
         # Facilities field
-        elif field == "facilities":
-            user_facilities = [normalize_facility_name(f.strip()) for f in user_input.split(',') if f.strip()]
-            filtered_properties = []
-            
-            for p in data:
-                facilities_dict = p.get("Facilities", {})
-                if not isinstance(facilities_dict, dict):
-                    continue
-                    
-                normalized_facilities = {normalize_facility_name(k): v for k, v in facilities_dict.items()}
-                
-                if all(facility in normalized_facilities and normalized_facilities[facility] == 1 for facility in user_facilities):
-                    filtered_properties.append(p)
-    
+        if field == "facilities":
+            user_facilities = frozenset(normalize_facility_name(f.strip()) for f in user_input.split(',') if f.strip())
+            user_mask = flags_mask(user_facilities, property_flag_bits["facilities"])
+            if user_mask is None:
+                return None  # a facility no property has
+            return lambda p: p["_facilities_mask"] is not None and (p["_facilities_mask"] & user_mask) == user_mask
+        
         # Nearby Amenities field
-        elif field == "nearby_amenities":
-            user_amenities = [normalize_amenity_name(a.strip()) for a in user_input.split(',') if a.strip()]
-            filtered_properties = []
-            
-            for p in data:
-                amenities_dict = p.get("Nearby_Amenities", {})
-                if not isinstance(amenities_dict, dict):
-                    continue
-                    
-                normalized_amenities = {normalize_amenity_name(k): v for k, v in amenities_dict.items()}
-                
-                if all(amenity in normalized_amenities and normalized_amenities[amenity] == 1 for amenity in user_amenities):
-                    filtered_properties.append(p)
-    
-        # Room Type field
-        elif field == "room_type":
-            filtered_properties = [p for p in data if 
-                                  normalize_room_name(p.get("Room_Details", {}).get("Rooms", "")) == normalized_user_input]
-    
-        # Property Type field
-        elif field == "property_type":
-            filtered_properties = [p for p in data if 
-                                  normalize_property_type_name(p.get("Room_Details", {}).get("Type", "")) == normalized_user_input]
-    
-        # Area field
-        elif field == "area":
-            filtered_properties = [p for p in data if 
-                                  normalize_area_name(p.get("Area", "N/A")) == normalize_area_name(user_input)]
-    
-        # Zone field
-        elif field == "zone":
-            filtered_properties = [p for p in data if 
-                                  normalize_zone_name(p.get("Zone", "N/A")) == normalize_zone_name(user_input)]
-            
-        # Property ID field
-        elif field == "id":
-            property_ids = [pid.strip().lower() for pid in user_input.split(",")]
-            filtered_properties = [p for p in data if str(p.get("property_id", "")).lower() in property_ids]
+        if field == "nearby_amenities":
+            user_amenities = frozenset(normalize_amenity_name(a.strip()) for a in user_input.split(',') if a.strip())
+            user_mask = flags_mask(user_amenities, property_flag_bits["nearby_amenities"])
+            if user_mask is None:
+                return None  # an amenity no property has
+            return lambda p: p["_amenities_mask"] is not None and (p["_amenities_mask"] & user_mask) == user_mask
         
         # Numeric fields
-        else:
-            try:
-                val = get_numeric_value(user_input)
-                if val is None:
-                    return []
-                
-                if user_input.lower().startswith("below"):
-                    filtered_properties = [
-                        p for p in data
-                        if get_numeric_value(p.get(data_field)) is not None
-                        and get_numeric_value(p.get(data_field)) < val
-                    ]
-                elif user_input.lower().startswith("above"):
-                    filtered_properties = [
-                        p for p in data
-                        if get_numeric_value(p.get(data_field)) is not None
-                        and get_numeric_value(p.get(data_field)) > val
-                    ]
-                elif user_input.lower().startswith("between"):
-                    nums = re.findall(r"\d+", user_input)
-                    if len(nums) >= 2:
-                        low, high = int(nums[0]), int(nums[1])
-                        filtered_properties = [
-                            p for p in data
-                            if get_numeric_value(p.get(data_field)) is not None
-                            and low <= get_numeric_value(p.get(data_field)) <= high
-                        ]
-                else:
-                    # Exact match
-                    filtered_properties = [
-                        p for p in data
-                        if get_numeric_value(p.get(data_field)) == val
-                    ]
-            except Exception as e:
-                st.warning(f"Error filtering by {field}: {str(e)}")
+        val = get_numeric_value(user_input)
+        if val is None:
+            return None
+        
+        if user_input.lower().startswith("below"):
+            return lambda p: (num := get_numeric_value(p.get(data_field))) is not None and num < val
+        if user_input.lower().startswith("above"):
+            return lambda p: (num := get_numeric_value(p.get(data_field))) is not None and num > val
+        if user_input.lower().startswith("between"):
+            nums = _NUM_RE.findall(user_input)
+            if len(nums) < 2:
+                return None
+            low, high = int(nums[0]), int(nums[1])
+            return lambda p: (num := get_numeric_value(p.get(data_field))) is not None and low <= num <= high
+        # Exact match
+        return lambda p: get_numeric_value(p.get(data_field)) == val
+    
+    def filter_all(filters, data):
+        """Properties of data matching every filter (AND logic), in one pass."""
+        predicates = []
+        for field, value in filters.items():
+            if field == "compare":
+                continue
+            predicate = field_predicate(value, field)
+            if predicate is None:
                 return []
+            predicates.append(predicate)
+        
+        try:
+            return [p for p in data if all(predicate(p) for predicate in predicates)]
+        except Exception as e:
+            st.warning(f"Error filtering properties: {str(e)}")
+            return []
     
-        return filtered_properties
+    # Apply every filter, memoized per filter set
+    @st.cache_data(max_entries=64, show_spinner=False)
+    def matching_property_indices(dataset_size, filters_key):
+        """Positions in properties_data of the properties matching all of filters_key.
+        
+        dataset_size ties the cached entries to the loaded data; both caches are
+        cleared together, so the size only guards against a reload with new data.
+        """
+        results = filter_all(dict(filters_key), properties_data)
+        position_of = {id(p): i for i, p in enumerate(properties_data)}
+        return [position_of[id(p)] for p in results]
     
     # Format results
     def format_property(prop, distance=None):
@@ -295,6 +473,9 @@ def run_residential_app():
     
     # Create property map
     def create_property_map(properties, user_location=None):
+        import folium
+        from folium.plugins import MarkerCluster
+        
         # Default to Nagpur coordinates if no properties or location data
         default_lat, default_lon = 21.1458, 79.0882  # Nagpur coordinates
         
@@ -313,34 +494,48 @@ def run_residential_app():
                 icon=folium.Icon(color='black', icon='user')
             ).add_to(m)
         
+        # Geocode each distinct area once instead of once per property
+        area_names = {}
+        for prop in properties:
+            if not ("Latitude" in prop and "Longitude" in prop):
+                area = prop.get("Area", "N/A")
+                area_names.setdefault(normalize_area_name(area), area)
+        area_coords = {key: geocode_area(area) for key, area in area_names.items()}
+        
         # Calculate distances if user location is provided
-        distances = []
         if user_location:
             user_lat, user_lon = user_location
+            located, lats, lons = [], [], []
             for prop in properties:
                 # Get property coordinates
                 if "Latitude" in prop and "Longitude" in prop:
                     prop_lat, prop_lon = prop["Latitude"], prop["Longitude"]
                 else:
-                    # Try to geocode the area name within Nagpur
-                    coords = geocode_area(prop.get("Area", "N/A"))
+                    # Use the area's geocoded location within Nagpur
+                    coords = area_coords.get(normalize_area_name(prop.get("Area", "N/A")))
                     if coords:
                         prop_lat, prop_lon = coords
                     else:
                         # Skip if we can't get coordinates
                         continue
-                
-                # Calculate distance
-                distance = haversine_distance(user_lat, user_lon, prop_lat, prop_lon)
-                distances.append(distance)
+                located.append(prop)
+                lats.append(prop_lat)
+                lons.append(prop_lon)
+            
+            # Calculate all distances in one vectorized pass
+            distances = haversine_many(user_lat, user_lon, np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64))
+            for prop, distance in zip(located, distances.tolist()):
                 # Store distance in property for later use
                 prop["distance_from_user"] = distance
             
             # Calculate average distance
-            avg_distance = sum(distances) / len(distances) if distances else 0
+            avg_distance = float(distances.mean()) if len(distances) else 0
         else:
             avg_distance = None
         
+        # Cluster property markers so large result sets stay responsive
+        marker_cluster = MarkerCluster().add_to(m)
+        
         # Add property markers
         for prop in properties:
             property_id = prop.get('property_id', 'N/A')
@@ -353,8 +548,8 @@ def run_residential_app():
             if "Latitude" in prop and "Longitude" in prop:
                 lat, lon = prop["Latitude"], prop["Longitude"]
             else:
-                # Try to geocode the area name within Nagpur
-                coords = geocode_area(area)
+                # Use the area's geocoded location within Nagpur
+                coords = area_coords.get(normalize_area_name(area))
                 if coords:
                     lat, lon = coords
                 else:
@@ -376,22 +571,18 @@ def run_residential_app():
                     else:
                         marker_color = 'red'   # Above average (farther)
             
-            popup_text = f"""
-            <b>ID:</b> {property_id}<br>
-            <b>Rent:</b> ₹{rent_price}<br>
-            <b>Area:</b> {area}<br>
-            <b>Size:</b> {size} sqft<br>
-            <b>Type:</b> {property_type}<br>
-            {distance_text}
-            """
+            popup_text = MARKER_POPUP_TEMPLATE.format(
+                property_id=property_id, rent=rent_price, area=area,
+                size=size, property_type=property_type, distance_text=distance_text
+            )
             
-            # Add marker to the map
+            # Add marker to the cluster layer
             folium.Marker(
                 location=[lat, lon],
                 popup=folium.Popup(popup_text, max_width=250),
                 tooltip=f"ID: {property_id} | Rent: ₹{rent_price}",
                 icon=folium.Icon(color=marker_color, icon='home')
-            ).add_to(m)
+            ).add_to(marker_cluster)
         
         # Add legend for distance colors
         if user_location and avg_distance is not None:
@@ -409,6 +600,19 @@ def run_residential_app():
         
         return m
     
+    # Analytics frame and counts for one result set, reused across reruns
+    @st.cache_data(max_entries=4, show_spinner=False)
+    def analytics_data(property_ids, user_location, _properties):
+        """Frame of the results (nested fields become "Parent.Child" columns) plus type / area counts.
+        
+        property_ids and user_location identify the result set, including the
+        distances the map view wrote onto it.
+        """
+        df = pd.json_normalize(_properties, sep=".")
+        type_counts = df.get("Room_Details.Type", pd.Series("Unknown", index=df.index)).fillna("Unknown").value_counts()
+        area_counts = df["Area"].value_counts() if "Area" in df.columns else None
+        return df, type_counts, area_counts
+    
     # Comparison Function
     def compare_properties_side_by_side(data, property_ids):
         selected = [p for p in data if str(p.get("property_id", "")).lower() in property_ids]
@@ -417,56 +621,45 @@ def run_residential_app():
             st.warning("⚠️ No properties found for the given IDs.")
             return
     
-        # Collect all possible comparison keys
-        comparison_keys = set()
-        for p in selected:
-            comparison_keys.update(p.keys())
-            if isinstance(p.get("Facilities"), dict):
-                comparison_keys.update([f"Facility: {k}" for k in p["Facilities"].keys()])
-            if isinstance(p.get("Nearby_Amenities"), dict):
-                comparison_keys.update([f"Amenity: {k}" for k in p["Nearby_Amenities"].keys()])
-            # Also include nested Room_Details keys
-            if isinstance(p.get("Room_Details"), dict):
-                comparison_keys.update([f"Room Details: {k}" for k in p["Room_Details"].keys()])
+        # One row per attribute, one column per property; "N/A" where a property lacks the key
+        def attribute_rows(records):
+            keys = sorted({k for r in records for k in r if not k.startswith("_")})
+            return pd.DataFrame([{**dict.fromkeys(keys, "N/A"), **r} for r in records], columns=keys).T
+    
+        def flag_rows(field, prefix):
+            flags = pd.DataFrame([p[field] if isinstance(p.get(field), dict) else {} for p in selected])
+            marks = pd.DataFrame(np.where(flags.eq(1), "✅", "❌"), columns=prefix + flags.columns.astype(str))
+            return marks.T
+    
+        top_rows = attribute_rows(selected)
+        room_rows = attribute_rows([p["Room_Details"] if isinstance(p.get("Room_Details"), dict) else {} for p in selected])
+        room_rows.index = "Room Details: " + room_rows.index.astype(str)
+    
+        # Format some values
+        for key, fmt in [("Rent_Price", "₹{}"), ("Security_Deposite", "₹{}"),
+                         ("Size_In_Sqft", "{} sqft"), ("Carpet_Area_Sqft", "{} sqft")]:
+            if key in top_rows.index:
+                row = top_rows.loc[key]
+                top_rows.loc[key] = row.where(row == "N/A", row.map(fmt.format))
+        if "Brokerage" in top_rows.index:
+            top_rows.loc["Brokerage"] = np.where(top_rows.loc["Brokerage"] == "yes", "Yes", "No")
+    
+        table = pd.concat([
+            top_rows,
+            flag_rows("Facilities", "Facility: "),
+            flag_rows("Nearby_Amenities", "Amenity: "),
+            room_rows
+        ])
     
         # Always show Property ID and Rent Price first for property comparison
         display_order = ["property_id", "Rent_Price"]
-        remaining_keys = sorted(k for k in comparison_keys if k not in display_order)
-        comparison_keys = display_order + remaining_keys
-    
-        # Build rows
-        rows = []
-        for key in comparison_keys:
-            row = [key.replace('_', ' ').title()]
-            for p in selected:
-                value = "N/A"
-                if key.startswith("Facility: "):
-                    fname = key.split(": ", 1)[1]
-                    value = "✅" if p.get("Facilities", {}).get(fname) == 1 else "❌"
-                elif key.startswith("Amenity: "):
-                    aname = key.split(": ", 1)[1]
-                    value = "✅" if p.get("Nearby_Amenities", {}).get(aname) == 1 else "❌"
-                elif key.startswith("Room Details: "):
-                    rdname = key.split(": ", 1)[1]
-                    value = p.get("Room_Details", {}).get(rdname, "N/A")
-                else:
-                    value = p.get(key, "N/A")
-    
-                # Format some values
-                if key in ["Rent_Price", "Security_Deposite"]:
-                    value = f"₹{value}" if value != "N/A" else value
-                elif key in ["Size_In_Sqft", "Carpet_Area_Sqft"]:
-                    value = f"{value} sqft" if value != "N/A" else value
-                elif key == "Brokerage":
-                    value = "Yes" if value == "yes" else "No"
-    
-                row.append(value)
-            rows.append(row)
-    
-        headers = ["Attribute"] + [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+        comparison_keys = display_order + sorted(k for k in table.index if k not in display_order)
+        table = table.reindex(comparison_keys, fill_value="N/A")
+        table.columns = [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+        table.insert(0, "Attribute", table.index.str.replace('_', ' ').str.title())
         
         # Create a DataFrame for better display
-        df = pd.DataFrame(rows, columns=headers)
+        df = table.reset_index(drop=True)
         st.dataframe(df.style.set_properties(**{'text-align': 'left'}), use_container_width=True)
     
     # Main content for residential app
@@ -506,14 +699,24 @@ def run_residential_app():
         ["Simple Search", "Advanced Search", "Compare Properties"]
     )
     
+    # Dropdown fields whose options are the dataset's distinct lowercased values
+    CATEGORY_FIELDS = {
+        "brokerage": "Brokerage", "furnishing": "Furnishing_Status", "maintenance": "Maintenance_Charge",
+        "recommended_for": "Recommended_For", "water_supply": "Water_Supply_Type", "society_type": "Society_Type"
+    }
+    
+    @st.cache_data(show_spinner=False)
+    def category_values(dataset_size, _properties):
+        """Sorted distinct values per CATEGORY_FIELDS field, collected in one pass."""
+        values = {field: set() for field in CATEGORY_FIELDS}
+        for p in _properties:
+            for field, data_field in CATEGORY_FIELDS.items():
+                values[field].add(str(p.get(data_field, "N/A")).lower())
+        return {field: sorted(found) for field, found in values.items()}
+    
     # Category options for dropdowns
     CATEGORY_OPTIONS = {
-        "brokerage": sorted(list(set(str(p.get("Brokerage", "N/A")).lower() for p in properties_data))),
-        "furnishing": sorted(list(set(str(p.get("Furnishing_Status", "N/A")).lower() for p in properties_data))),
-        "maintenance": sorted(list(set(str(p.get("Maintenance_Charge", "N/A")).lower() for p in properties_data))),
-        "recommended_for": sorted(list(set(str(p.get("Recommended_For", "N/A")).lower() for p in properties_data))),
-        "water_supply": sorted(list(set(str(p.get("Water_Supply_Type", "N/A")).lower() for p in properties_data))),
-        "society_type": sorted(list(set(str(p.get("Society_Type", "N/A")).lower() for p in properties_data))),
+        **category_values(len(properties_data), properties_data),
         "area": ALL_AREAS,
         "zone": ALL_ZONES,
         "room_type": ALL_ROOM_TYPES,
@@ -648,7 +851,7 @@ def run_residential_app():
     if st.session_state.residential_apply_filters:
         # Handle comparison mode
         if search_mode == "Compare Properties" and "compare" in st.session_state.residential_filters:
-            property_ids = [pid.strip().lower() for pid in st.session_state.residential_filters["compare"].split(",")]
+            property_ids = _ID_SPLIT_RE.split(st.session_state.residential_filters["compare"].strip().lower())
             if len(property_ids) < 2:
                 st.warning("⚠️ Please enter at least two Property IDs to compare.")
             else:
@@ -656,10 +859,8 @@ def run_residential_app():
                 compare_properties_side_by_side(properties_data, property_ids)
         else:
             # Apply all selected filters
-            results = properties_data
-            for field, value in st.session_state.residential_filters.items():
-                if field != "compare":
-                    results = filter_properties(value, field, results)
+            filters_key = tuple(sorted(st.session_state.residential_filters.items()))
+            results = [properties_data[i] for i in matching_property_indices(len(properties_data), filters_key)]
             
             if not results:
                 st.warning("❌ No properties found matching your criteria in Nagpur.")
@@ -695,6 +896,7 @@ def run_residential_app():
                     
                     # Create and display the map
                     try:
+                        from streamlit_folium import folium_static
                         property_map = create_property_map(results, st.session_state.residential_user_location)
                         folium_static(property_map, width=700, height=500)
                         
@@ -718,60 +920,47 @@ def run_residential_app():
                     
                     # Create analytics visualizations
                     if results:
+                        import plotly.express as px
+                        
                         # Convert to DataFrame for easier analysis
-                        df = pd.DataFrame(results)
+                        df, type_counts, area_counts = analytics_data(
+                            tuple(p.get("property_id") for p in results), st.session_state.residential_user_location, results
+                        )
                         
                         # Rent distribution
                         st.subheader("Rent Distribution in Nagpur")
-                        fig_rent = px.histogram(
-                            df, 
-                            x="Rent_Price", 
-                            nbins=20,
-                            title="Distribution of Property Rents in Nagpur",
-                            labels={"Rent_Price": "Rent (₹)", "count": "Number of Properties"}
-                        )
-                        st.plotly_chart(fig_rent, use_container_width=True)
+                        fig_rent = histogram_figure(df["Rent_Price"], 20, "Distribution of Property Rents in Nagpur", "Rent (₹)")
+                        st.plotly_chart(fig_rent, use_container_width=True, key="residential_rent_hist")
                         
                         # Property types
                         st.subheader("Property Types in Nagpur")
-                        prop_types = [prop.get("Room_Details", {}).get("Type", "Unknown") for prop in results]
-                        type_counts = pd.Series(prop_types).value_counts()
-                        
                         fig_types = px.pie(
                             values=type_counts.values,
                             names=type_counts.index,
                             title="Distribution of Property Types in Nagpur"
                         )
-                        st.plotly_chart(fig_types, use_container_width=True)
+                        st.plotly_chart(fig_types, use_container_width=True, key="residential_type_pie")
                         
                         # Area distribution
-                        if "Area" in df.columns:
+                        if area_counts is not None:
                             st.subheader("Properties by Area in Nagpur")
-                            area_counts = df["Area"].value_counts()
-                            
                             fig_area = px.bar(
                                 x=area_counts.index,
                                 y=area_counts.values,
                                 labels={"x": "Area", "y": "Number of Properties"},
                                 title="Properties by Area in Nagpur"
                             )
-                            st.plotly_chart(fig_area, use_container_width=True)
+                            st.plotly_chart(fig_area, use_container_width=True, key="residential_area_bar")
                         
                         # Distance distribution if user location is set
                         if st.session_state.residential_user_location and "distance_from_user" in df.columns:
                             st.subheader("Distance Distribution from Your Location")
-                            fig_distance = px.histogram(
-                                df,
-                                x="distance_from_user",
-                                nbins=15,
-                                title="Distribution of Property Distances from Your Location",
-                                labels={"distance_from_user": "Distance (km)", "count": "Number of Properties"}
-                            )
+                            fig_distance = histogram_figure(df["distance_from_user"], 15, "Distribution of Property Distances from Your Location", "Distance (km)")
                             # Add average distance line
                             avg_distance = df["distance_from_user"].mean()
                             fig_distance.add_vline(x=avg_distance, line_dash="dash", line_color="red",
                                                  annotation_text=f"Avg: {avg_distance:.2f} km")
-                            st.plotly_chart(fig_distance, use_container_width=True)
+                            st.plotly_chart(fig_distance, use_container_width=True, key="residential_distance_hist")
     else:
         # Display welcome message and sample properties
         st.header("Welcome to Property Search Assistant - Nagpur")
@@ -790,7 +979,7 @@ def run_residential_app():
         
         # Display some sample properties
         st.subheader("Featured Properties in Nagpur")
-        sample_properties = properties_data[:4] if len(properties_data) >= 4 else properties_data
+        sample_properties = properties_data[:4]
         
         cols = st.columns(2)
         for i, prop in enumerate(sample_properties):
@@ -811,34 +1000,118 @@ def run_commercial_app():
     if 'commercial_user_location' not in st.session_state:
         st.session_state.commercial_user_location = None
     
-    # Initialize session state for filtered properties
-    if 'commercial_filtered_properties' not in st.session_state:
-        st.session_state.commercial_filtered_properties = []
+    # Fields filtered by case-insensitive string match
+    STRING_FILTER_FIELDS = [
+        "city", "area", "zone", "property_type", "ownership", "possession_status",
+        "location_hub", "property_id", "floor_no", "brokerage", "negotiable"
+    ]
+    
+    # min_/max_ filter suffix -> numeric column
+    RANGE_FILTER_FIELDS = {
+        "rent": "rent_price", "size": "size_in_sqft", "carpet_area": "carpet_area_sqft",
+        "age": "property_age", "security_deposit": "security_deposit",
+        "total_floors": "total_floors", "lock_in_period": "lock_in_period_in_months"
+    }
+    
+    # Properties shown per property-type group in the list view
+    LIST_PAGE_SIZE = 20
+    
+    # Multiselect widgets whose filter takes a single lowercase value
+    SINGLE_CHOICE_FILTERS = {"brokerage", "furnishing"}
+    
+    # Most selective filters run first so an empty result can stop the loop early
+    FILTER_PRIORITY = {
+        "property_id": 0,
+        "min_rent": 1, "max_rent": 1, "min_size": 1, "max_size": 1,
+        "facilities": 2, "floor": 2,
+        "area": 3, "zone": 3, "location_hub": 3, "floor_no": 3,
+        "city": 5
+    }
+    
+    # Build a columnar view of the properties for vectorized filtering
+    def build_properties_frame(properties):
+        """Row i of the frame describes properties[i]."""
+        frame = pd.DataFrame({
+            field: [str(p.get(field, "")).lower() for p in properties]
+            for field in STRING_FILTER_FIELDS
+        })
+        for column in RANGE_FILTER_FIELDS.values():
+            if column == "lock_in_period_in_months":
+                values = [p.get("charges", {}).get(column) for p in properties]
+            else:
+                values = [p.get(column) for p in properties]
+            frame[column] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        facilities_frame = pd.DataFrame([p.get("facilities", {}) for p in properties]).add_prefix("facility:")
+        return pd.concat([frame, facilities_frame], axis=1)
+    
+    # Pack the available facilities / floors of each property into uint64 bit words
+    def build_flag_words(properties, field):
+        """Return (words, bit_of): bit bit_of[name] of row i is set when properties[i][field][name] == 1."""
+        bit_of = {}
+        for p in properties:
+            for name in p.get(field, {}):
+                bit_of.setdefault(name, len(bit_of))
+        packed = [sum(1 << bit_of[name] for name, val in p.get(field, {}).items() if val == 1) for p in properties]
+        word_count = max(1, -(-len(bit_of) // 64))
+        words = np.array(
+            [[(bits >> (64 * j)) & 0xFFFFFFFFFFFFFFFF for j in range(word_count)] for bits in packed],
+            dtype=np.uint64
+        ).reshape(len(properties), word_count)
+        return words, bit_of
+    
+    # Fields offered as dropdown / multiselect options
+    OPTION_FIELDS = [
+        "city", "area", "zone", "property_type", "ownership",
+        "possession_status", "location_hub", "floor_no"
+    ]
+    
+    # Collect the sorted option lists for the filter widgets
+    def build_filter_options(properties):
+        """Sorted unique values per OPTION_FIELDS field, plus available facilities and floors, in one pass."""
+        values = {field: set() for field in OPTION_FIELDS}
+        facilities, floors = set(), set()
+        for p in properties:
+            for field in OPTION_FIELDS:
+                value = p.get(field)
+                if value:
+                    values[field].add(str(value))
+            facilities.update(fac for fac, val in p.get("facilities", {}).items() if val == 1)
+            floors.update(floor for floor, val in p.get("floor_availability", {}).items() if val == 1)
+        options = {field: sorted(found) for field, found in values.items()}
+        options["facilities"] = sorted({fac.replace('_', ' ').title() for fac in facilities})
+        options["floors"] = sorted({floor.replace('_', ' ').title() for floor in floors})
+        return options
     
     # Load properties from JSON file
     @st.cache_data
     def load_properties():
         try:
-            with open("commercial_data.json", "r") as f:
-                properties = json.load(f)
-                nagpur_properties = [p for p in properties if 
-                                  p.get("city", "").lower() == "nagpur" or 
-                                  p.get("area", "").lower().find("nagpur") != -1]
-                return nagpur_properties
+            properties = load_json_file("commercial_data.json")
+            nagpur_properties = [p for p in properties if 
+                              p.get("city", "").lower() == "nagpur" or 
+                              p.get("area", "").lower().find("nagpur") != -1]
+            # Flatten the furnishing facility into a boolean field the analytics frame can count
+            for p in nagpur_properties:
+                p["furnished"] = p.get("facilities", {}).get("furnishing") == 1
+            flag_words = {field: build_flag_words(nagpur_properties, field) for field in ("facilities", "floor_availability")}
+            return nagpur_properties, build_properties_frame(nagpur_properties), flag_words, build_filter_options(nagpur_properties)
         except FileNotFoundError:
             st.error("Error: 'commercial_data.json' not found. Please ensure the file exists.")
-            return []
+            return [], build_properties_frame([]), {field: build_flag_words([], field) for field in ("facilities", "floor_availability")}, build_filter_options([])
         except json.JSONDecodeError:
             st.error("Error: Could not decode 'commercial_data.json'. Please check its format.")
-            return []
+            return [], build_properties_frame([]), {field: build_flag_words([], field) for field in ("facilities", "floor_availability")}, build_filter_options([])
+    
+    properties_data, properties_df, properties_flag_words, filter_options = load_properties()
     
-    properties_data = load_properties()
-    if properties_data:
+    # Initialize session state for filtered properties with the full dataset;
+    # later reruns (view switches, paging, expanders) keep the applied results
+    if 'commercial_filtered_properties' not in st.session_state:
         st.session_state.commercial_filtered_properties = properties_data
     
     # Helper for normalization
     def normalize_facility_name(facility_name):
-        return str(facility_name).replace(" ", "_").lower().strip()
+        return str(facility_name).replace(" ", "_").lower()
     
     # Function to format property details
     def format_property(prop, distance=None):
@@ -898,170 +1171,109 @@ def run_commercial_app():
             f"**Available Floors:** {floors_str}"
         )
     
+    # Helper for facility / floor flag columns
+    def frame_flag(frame, column, flag):
+        """Boolean array of rows whose flag column equals flag (False if the column is absent)."""
+        if column not in frame:
+            return np.zeros(len(frame), dtype=bool)
+        return (frame[column] == flag).to_numpy()
+    
+    # Helper for facility / floor bit words
+    def flag_words_mask(flag_words, names):
+        """Boolean array of rows that have every name set (all False if a name is unknown)."""
+        words, bit_of = flag_words
+        if any(name not in bit_of for name in names):
+            return np.zeros(len(words), dtype=bool)
+        wanted = np.zeros(words.shape[1], dtype=np.uint64)
+        for name in names:
+            wanted[bit_of[name] // 64] |= np.uint64(1 << (bit_of[name] % 64))
+        return ((words & wanted) == wanted).all(axis=1)
+    
     # Function to filter properties by multiple criteria
-    def filter_properties(data, filters):
-        """Filter properties based on multiple criteria (AND logic)."""
-        filtered = data.copy()
+    def filter_properties(data, frame, flag_words, filters):
+        """Filter properties based on multiple criteria (AND logic).
         
-        # Apply each filter separately (AND logic)
-        for filter_type, value in filters.items():
-            if filter_type == "city" and value:
-                filtered = [p for p in filtered if p.get("city", "").lower() == value.lower()]
-            
-            elif filter_type == "area" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("area", "").lower() in [v.lower() for v in value]]
-                else:
-                    filtered = [p for p in filtered if p.get("area", "").lower() == value.lower()]
-            
-            elif filter_type == "zone" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("zone", "").lower() in [v.lower() for v in value]]
-                else:
-                    filtered = [p for p in filtered if p.get("zone", "").lower() == value.lower()]
-            
-            elif filter_type == "property_type" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("property_type", "").lower() in [v.lower() for v in value]]
-                else:
-                    filtered = [p for p in filtered if p.get("property_type", "").lower() == value.lower()]
-            
-            elif filter_type == "ownership" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("ownership", "").lower() in [v.lower() for v in value]]
-                else:
-                    filtered = [p for p in filtered if p.get("ownership", "").lower() == value.lower()]
-            
-            elif filter_type == "possession_status" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("possession_status", "").lower() in [v.lower() for v in value]]
-                else:
-                    filtered = [p for p in filtered if p.get("possession_status", "").lower() == value.lower()]
+        frame is the build_properties_frame() view of data and flag_words the
+        build_flag_words() packing of its facilities / floors; all criteria are
+        combined into one boolean mask.
+        """
+        mask = np.ones(len(data), dtype=bool)
+        
+        # Apply each filter separately (AND logic), most selective first
+        for filter_type, value in sorted(filters.items(), key=lambda item: FILTER_PRIORITY.get(item[0], 4)):
+            if not mask.any():
+                break
             
-            elif filter_type == "location_hub" and value:
+            if filter_type in STRING_FILTER_FIELDS and value:
                 # Handle both single value and list of values
+                column = frame[filter_type]
                 if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("location_hub", "").lower() in [v.lower() for v in value]]
+                    mask &= column.isin([v.lower() for v in value]).to_numpy()
                 else:
-                    filtered = [p for p in filtered if p.get("location_hub", "").lower() == value.lower()]
+                    mask &= (column == value.lower()).to_numpy()
             
-            elif filter_type == "property_id" and value:
-                filtered = [p for p in filtered if p.get("property_id", "").lower() == value.lower()]
-            
-            elif filter_type == "floor_no" and value:
-                # Handle both single value and list of values
-                if isinstance(value, list):
-                    filtered = [p for p in filtered if p.get("floor_no", "").lower() in [v.lower() for v in value]]
+            elif filter_type.startswith(("min_", "max_")) and filter_type[4:] in RANGE_FILTER_FIELDS and value is not None:
+                column = frame[RANGE_FILTER_FIELDS[filter_type[4:]]]
+                # Missing values count as 0 for minimums and infinity for maximums
+                if filter_type.startswith("min_"):
+                    mask &= (column.fillna(0) >= value).to_numpy()
                 else:
-                    filtered = [p for p in filtered if p.get("floor_no", "").lower() == value.lower()]
-            
-            elif filter_type == "min_rent" and value is not None:
-                filtered = [p for p in filtered if p.get("rent_price", 0) >= value]
-            
-            elif filter_type == "max_rent" and value is not None:
-                filtered = [p for p in filtered if p.get("rent_price", float('inf')) <= value]
-            
-            elif filter_type == "min_size" and value is not None:
-                filtered = [p for p in filtered if p.get("size_in_sqft", 0) >= value]
-            
-            elif filter_type == "max_size" and value is not None:
-                filtered = [p for p in filtered if p.get("size_in_sqft", float('inf')) <= value]
-            
-            elif filter_type == "min_carpet_area" and value is not None:
-                filtered = [p for p in filtered if p.get("carpet_area_sqft", 0) >= value]
-            
-            elif filter_type == "max_carpet_area" and value is not None:
-                filtered = [p for p in filtered if p.get("carpet_area_sqft", float('inf')) <= value]
-            
-            elif filter_type == "min_age" and value is not None:
-                filtered = [p for p in filtered if p.get("property_age", 0) >= value]
-            
-            elif filter_type == "max_age" and value is not None:
-                filtered = [p for p in filtered if p.get("property_age", float('inf')) <= value]
-            
-            elif filter_type == "min_security_deposit" and value is not None:
-                filtered = [p for p in filtered if p.get("security_deposit", 0) >= value]
-            
-            elif filter_type == "max_security_deposit" and value is not None:
-                filtered = [p for p in filtered if p.get("security_deposit", float('inf')) <= value]
-            
-            elif filter_type == "min_total_floors" and value is not None:
-                filtered = [p for p in filtered if p.get("total_floors", 0) >= value]
-            
-            elif filter_type == "max_total_floors" and value is not None:
-                filtered = [p for p in filtered if p.get("total_floors", float('inf')) <= value]
-            
-            elif filter_type == "min_lock_in_period" and value is not None:
-                filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", 0) >= value]
-            
-            elif filter_type == "max_lock_in_period" and value is not None:
-                filtered = [p for p in filtered if p.get("charges", {}).get("lock_in_period_in_months", float('inf')) <= value]
+                    mask &= (column.fillna(float('inf')) <= value).to_numpy()
             
             elif filter_type == "furnishing" and value:
                 # value will be either "furnished" or "unfurnished"
                 furnishing_value = 1 if value.lower() == "furnished" else 0
-                filtered = [p for p in filtered if p.get("facilities", {}).get("furnishing") == furnishing_value]
-            
-            elif filter_type == "brokerage" and value:
-                filtered = [p for p in filtered if p.get("brokerage", "").lower() == value.lower()]
-            
-            elif filter_type == "negotiable" and value:
-                filtered = [p for p in filtered if p.get("negotiable", "").lower() == value.lower()]
+                mask &= frame_flag(frame, "facility:furnishing", furnishing_value)
             
             elif filter_type == "facilities" and value:
-                # Normalize user facilities
-                user_facilities = [normalize_facility_name(f) for f in value]
-                # Filter properties that have ALL the selected facilities (AND logic)
-                temp_filtered = []
-                for p in filtered:
-                    facilities = p.get("facilities", {})
-                    # Check if the property has every facility in user_facilities
-                    if all(facilities.get(fac) == 1 for fac in user_facilities):
-                        temp_filtered.append(p)
-                filtered = temp_filtered
+                # Keep properties that have ALL the selected facilities (AND logic)
+                mask &= flag_words_mask(flag_words["facilities"], [normalize_facility_name(fac) for fac in value])
             
             elif filter_type == "floor" and value:
-                # Normalize user floor selection
-                user_floor = normalize_facility_name(value)
-                # Filter properties that have the selected floor available
-                filtered = [p for p in filtered if p.get("floor_availability", {}).get(user_floor) == 1]
+                # Keep properties that have the selected floor available
+                mask &= flag_words_mask(flag_words["floor_availability"], [normalize_facility_name(value)])
+        
+        return [data[i] for i in np.flatnonzero(mask)]
+    
+    # Above this many results the Size vs Rent chart is binned instead of drawn point by point
+    SCATTER_POINT_LIMIT = 2000
+    
+    # Property fields the analytics charts use
+    ANALYTICS_COLUMNS = [
+        "property_id", "listing_title", "property_type", "area",
+        "rent_price", "size_in_sqft", "property_age", "distance_from_user", "furnished"
+    ]
+    
+    # Analytics frame and counts for one result set, reused across reruns
+    @st.cache_data(max_entries=4, show_spinner=False)
+    def analytics_data(property_ids, user_location, _properties):
+        """Frame of the results plus type / area / furnishing counts.
         
-        return filtered
-    
-    # Function to get unique values for a field
-    def get_unique_values(data, field):
-        """Get unique values for a specific field from the data."""
-        values = set()
-        for p in data:
-            value = p.get(field)
-            if value:
-                values.add(str(value))
-        return sorted(values)
-    
-    # Function to get all available facilities
-    def get_all_facilities(data):
-        """Get all facilities that are available in any property."""
-        facilities = set()
-        for p in data:
-            for fac, val in p.get("facilities", {}).items():
-                if val == 1:
-                    facilities.add(fac.replace('_', ' ').title())
-        return sorted(facilities)
-    
-    # Function to get all available floors
-    def get_all_floors(data):
-        """Get all floors that are available in any property."""
-        floors = set()
-        for p in data:
-            for floor, val in p.get("floor_availability", {}).items():
-                if val == 1:
-                    floors.add(floor.replace('_', ' ').title())
-        return sorted(floors)
+        property_ids and user_location identify the result set, including the
+        distances the map view wrote onto it.
+        """
+        # Only the columns the charts read, each present when any property has it
+        df = pd.DataFrame({
+            column: [p.get(column, np.nan) for p in _properties]
+            for column in ANALYTICS_COLUMNS if any(column in p for p in _properties)
+        }, index=pd.RangeIndex(len(_properties)))
+        # Categorical labels are counted from their integer codes; first-seen category order keeps ties in listing order
+        for column in ("property_type", "area"):
+            if column in df.columns:
+                df[column] = pd.Categorical(df[column], categories=df[column].dropna().unique())
+        type_counts = df["property_type"].value_counts()
+        area_counts = df["area"].value_counts() if "area" in df.columns else None
+        furnishing_counts = {"Furnished": int(df["furnished"].sum()), "Unfurnished": int((~df["furnished"]).sum())}
+        return df, type_counts, area_counts, furnishing_counts
+    
+    # Result positions per property type, reused across reruns
+    @st.cache_data(max_entries=4, show_spinner=False)
+    def group_by_type(property_ids, _properties):
+        """Map each property type to the positions of its properties, in first-seen order."""
+        groups = defaultdict(list)
+        for i, prop in enumerate(_properties):
+            groups[prop.get("property_type", "Other/Unspecified Type")].append(i)
+        return dict(groups)
     
     # Function to compare properties side by side
     def compare_properties_side_by_side(data, property_ids):
@@ -1072,102 +1284,124 @@ def run_commercial_app():
             st.warning("⚠️ No properties found for the given IDs.")
             return
         
-        # Collect all possible comparison keys
-        comparison_keys = set()
-        for p in selected:
-            comparison_keys.update(p.keys())
-            if isinstance(p.get("facilities"), dict):
-                comparison_keys.update([f"Facility: {k}" for k in p["facilities"].keys()])
-            if isinstance(p.get("floor_availability"), dict):
-                comparison_keys.update([f"Floor: {k}" for k in p["floor_availability"].keys()])
+        # One row per attribute, one column per property; "N/A" where a property lacks the key
+        keys = sorted({k for p in selected for k in p if not k.startswith("_")})
+        top_rows = pd.DataFrame([{**dict.fromkeys(keys, "N/A"), **p} for p in selected], columns=keys).T
         
-        # Always show Property ID and Rent Price first for property comparison
-        display_order = ["property_id", "rent_price"]
-        remaining_keys = sorted(k for k in comparison_keys if k not in display_order)
-        comparison_keys = display_order + remaining_keys
+        def flag_rows(field, prefix):
+            flags = pd.DataFrame([p[field] if isinstance(p.get(field), dict) else {} for p in selected])
+            marks = pd.DataFrame(np.where(flags.eq(1), "✅", "❌"), columns=prefix + flags.columns.astype(str))
+            return marks.T
         
-        # Build rows
-        rows = []
-        for key in comparison_keys:
-            row = [key.replace('_', ' ').title()]
-            for p in selected:
-                value = "N/A"
-                if key.startswith("Facility: "):
-                    fname = key.split(": ", 1)[1]
-                    value = "✅" if p.get("facilities", {}).get(fname) == 1 else "❌"
-                elif key.startswith("Floor: "):
-                    fname = key.split(": ", 1)[1]
-                    value = "✅" if p.get("floor_availability", {}).get(fname) == 1 else "❌"
-                else:
-                    value = p.get(key, "N/A")
-                
-                # Format some values
-                if key in ["rent_price", "security_deposit"]:
-                    value = f"₹{value}" if value != "N/A" else value
-                elif key in ["size_in_sqft", "carpet_area_sqft"]:
-                    value = f"{value} sqft" if value != "N/A" else value
-                elif key == "brokerage":
-                    value = "Yes" if value == "yes" else "No"
-                
-                row.append(value)
-            rows.append(row)
+        # Format some values
+        for key, fmt in [("rent_price", "₹{}"), ("security_deposit", "₹{}"),
+                         ("size_in_sqft", "{} sqft"), ("carpet_area_sqft", "{} sqft")]:
+            if key in top_rows.index:
+                row = top_rows.loc[key]
+                top_rows.loc[key] = row.where(row == "N/A", row.map(fmt.format))
+        if "brokerage" in top_rows.index:
+            top_rows.loc["brokerage"] = np.where(top_rows.loc["brokerage"] == "yes", "Yes", "No")
         
-        headers = ["Attribute"] + [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+        table = pd.concat([
+            top_rows,
+            flag_rows("facilities", "Facility: "),
+            flag_rows("floor_availability", "Floor: ")
+        ])
+        
+        # Always show Property ID and Rent Price first for property comparison
+        display_order = ["property_id", "rent_price"]
+        comparison_keys = display_order + sorted(k for k in table.index if k not in display_order)
+        table = table.reindex(comparison_keys, fill_value="N/A")
+        table.columns = [f"ID {p.get('property_id', 'N/A')}" for p in selected]
+        table.insert(0, "Attribute", table.index.str.replace('_', ' ').str.title())
         
         # Create a DataFrame for better display
-        df = pd.DataFrame(rows, columns=headers)
+        df = table.reset_index(drop=True)
         st.dataframe(df.style.set_properties(**{'text-align': 'left'}), use_container_width=True)
     
-    # Function to create property map
-    def create_property_map(properties, user_location=None):
-        """Create a Folium map with property markers for Nagpur."""
-        # Default to Nagpur coordinates
-        nagpur_lat, nagpur_lon = 21.1458, 79.0882
-        
-        # Create a map centered around Nagpur
-        m = folium.Map(location=[nagpur_lat, nagpur_lon], zoom_start=12)
-        
-        # Add tile layer
-        folium.TileLayer('OpenStreetMap').add_to(m)
-        
-        # Add user location marker if provided
-        if user_location:
-            folium.Marker(
-                location=user_location,
-                popup="Your Location",
-                tooltip="You are here",
-                icon=folium.Icon(color='black', icon='user')
-            ).add_to(m)
+    # Geocode the properties and write each one's distance from the user onto it
+    def add_distances(properties, user_location=None):
+        """Return (area_coords, avg_distance); avg_distance is None without a user location."""
+        # Geocode each distinct area once instead of once per property
+        area_coords = {
+            area: geocode_area(area)
+            for area in {prop.get("area", "N/A") for prop in properties if not ("latitude" in prop and "longitude" in prop)}
+        }
         
         # Calculate distances if user location is provided
-        distances = []
         if user_location:
             user_lat, user_lon = user_location
+            located, lats, lons = [], [], []
             for prop in properties:
                 # Try to get coordinates from property data
                 if "latitude" in prop and "longitude" in prop:
                     prop_lat, prop_lon = prop["latitude"], prop["longitude"]
                 else:
-                    # Try to geocode the area name within Nagpur
-                    coords = geocode_area(prop.get("area", "N/A"))
+                    # Use the area's geocoded location within Nagpur
+                    coords = area_coords.get(prop.get("area", "N/A"))
                     if coords:
                         prop_lat, prop_lon = coords
                     else:
                         # Skip if we can't get coordinates
                         continue
-                
-                # Calculate distance using Haversine formula
-                distance = haversine_distance(user_lat, user_lon, prop_lat, prop_lon)
-                distances.append(distance)
+                located.append(prop)
+                lats.append(prop_lat)
+                lons.append(prop_lon)
+            
+            # Calculate all distances in one vectorized Haversine pass
+            distances = haversine_many(user_lat, user_lon, np.array(lats, dtype=np.float64), np.array(lons, dtype=np.float64))
+            for prop, distance in zip(located, distances.tolist()):
                 prop["distance_from_user"] = distance
             
             # Calculate average distance
-            avg_distance = sum(distances) / len(distances) if distances else 0
+            avg_distance = float(distances.mean()) if len(distances) else 0
         else:
             avg_distance = None
         
+        return area_coords, avg_distance
+    
+    # Function to create property map
+    def create_property_map(properties, user_location=None, located=None):
+        """Create a Folium map with property markers for Nagpur."""
+        # Geocode the areas and calculate distances unless add_distances already ran for these properties
+        area_coords, avg_distance = located or add_distances(properties, user_location)
+        
+        property_ids = tuple(prop.get('property_id', 'N/A') for prop in properties)
+        user_key = tuple(user_location) if user_location else None
+        # The resolved coordinates are part of the key, so areas that failed to geocode get markers once they resolve
+        coords_key = tuple(sorted((str(area), tuple(coords) if coords else None) for area, coords in area_coords.items()))
+        return cached_marker_map(property_ids, user_key, avg_distance, coords_key, properties, area_coords), avg_distance
+    
+    # Folium map for one result set, reused across reruns
+    @st.cache_resource(max_entries=16, show_spinner=False)
+    def cached_marker_map(property_ids, user_location, avg_distance, coords_key, _properties, _area_coords):
+        """Build the marker map once per (property IDs, user location, area coordinates); distances are already on the properties."""
+        import folium
+        from folium.plugins import MarkerCluster
+        
+        # Default to Nagpur coordinates
+        nagpur_lat, nagpur_lon = 21.1458, 79.0882
+        
+        # Create a map centered around Nagpur
+        m = folium.Map(location=[nagpur_lat, nagpur_lon], zoom_start=12)
+        
+        # Add tile layer
+        folium.TileLayer('OpenStreetMap').add_to(m)
+        
+        # Add user location marker if provided
+        if user_location:
+            folium.Marker(
+                location=list(user_location),
+                popup="Your Location",
+                tooltip="You are here",
+                icon=folium.Icon(color='black', icon='user')
+            ).add_to(m)
+        
+        # Cluster property markers so large result sets stay responsive
+        marker_cluster = MarkerCluster().add_to(m)
+        
         # Add property markers
-        for prop in properties:
+        for prop in _properties:
             property_id = prop.get('property_id', 'N/A')
             rent_price = prop.get('rent_price', 'N/A')
             area = prop.get('area', 'N/A')
@@ -1178,8 +1412,8 @@ def run_commercial_app():
             if "latitude" in prop and "longitude" in prop:
                 lat, lon = prop["latitude"], prop["longitude"]
             else:
-                # Try to geocode the area name within Nagpur
-                coords = geocode_area(area)
+                # Use the area's geocoded location within Nagpur
+                coords = _area_coords.get(area)
                 if coords:
                     lat, lon = coords
                 else:
@@ -1201,22 +1435,18 @@ def run_commercial_app():
                     else:
                         marker_color = 'red'   # Above average (farther)
             
-            popup_text = f"""
-            <b>ID:</b> {property_id}<br>
-            <b>Rent:</b> ₹{rent_price}<br>
-            <b>Area:</b> {area}<br>
-            <b>Size:</b> {size} sqft<br>
-            <b>Type:</b> {property_type}<br>
-            {distance_text}
-            """
+            popup_text = MARKER_POPUP_TEMPLATE.format(
+                property_id=property_id, rent=rent_price, area=area,
+                size=size, property_type=property_type, distance_text=distance_text
+            )
             
-            # Add marker to the map
+            # Add marker to the cluster layer
             folium.Marker(
                 location=[lat, lon],
                 popup=folium.Popup(popup_text, max_width=250),
                 tooltip=f"ID: {property_id} | Rent: ₹{rent_price}",
                 icon=folium.Icon(color=marker_color, icon='home')
-            ).add_to(m)
+            ).add_to(marker_cluster)
         
         # Add legend for distance colors
         if user_location and avg_distance is not None:
@@ -1232,19 +1462,19 @@ def run_commercial_app():
             '''
             m.get_root().html.add_child(folium.Element(legend_html))
         
-        return m, avg_distance
-    
-    # Get unique values for dropdowns
-    cities = get_unique_values(properties_data, "city")
-    areas = get_unique_values(properties_data, "area")
-    zones = get_unique_values(properties_data, "zone")
-    property_types = get_unique_values(properties_data, "property_type")
-    ownerships = get_unique_values(properties_data, "ownership")
-    possession_statuses = get_unique_values(properties_data, "possession_status")
-    location_hubs = get_unique_values(properties_data, "location_hub")
-    floor_nos = get_unique_values(properties_data, "floor_no")
-    facilities = get_all_facilities(properties_data)
-    floors = get_all_floors(properties_data)
+        return m
+    
+    # Unique values for dropdowns, computed once by the cached loader
+    cities = filter_options["city"]
+    areas = filter_options["area"]
+    zones = filter_options["zone"]
+    property_types = filter_options["property_type"]
+    ownerships = filter_options["ownership"]
+    possession_statuses = filter_options["possession_status"]
+    location_hubs = filter_options["location_hub"]
+    floor_nos = filter_options["floor_no"]
+    facilities = filter_options["facilities"]
+    floors = filter_options["floors"]
     
     # Add Nagpur city badge at the top
     st.markdown("### 🔍 Search in Nagpur City")
@@ -1281,84 +1511,9 @@ def run_commercial_app():
     if st.session_state.commercial_user_location:
         st.info(f"Your location: {st.session_state.commercial_user_location[0]:.6f}, {st.session_state.commercial_user_location[1]:.6f}")
     
-    # Search Filters section
-    st.subheader("🔍 Search Filters")
-    search_mode = st.radio(
-        "Select Search Mode",
-        ["Simple Search", "Advanced Search", "Compare Properties"]
-    )
-    
-    # Simple Search Mode
-    if search_mode == "Simple Search":
-        with st.expander("Quick Search Options", expanded=True):
-            # Quick search options
-            quick_search = st.selectbox(
-                "Select search criteria",
-                ["Rent Price", "Area", "Property Type", "Size"]
-            )
-            
-            if quick_search == "Rent Price":
-                rent_option = st.radio(
-                    "Rent preference",
-                    ["Below budget", "Above budget", "Exact amount", "Range"]
-                )
-                
-                if rent_option == "Below budget":
-                    max_rent = st.number_input("Maximum rent (₹)", min_value=1000, value=20000, step=1000)
-                    st.session_state.commercial_filters["max_rent"] = max_rent
-                elif rent_option == "Above budget":
-                    min_rent = st.number_input("Minimum rent (₹)", min_value=1000, value=10000, step=1000)
-                    st.session_state.commercial_filters["min_rent"] = min_rent
-                elif rent_option == "Exact amount":
-                    exact_rent = st.number_input("Exact rent (₹)", min_value=1000, value=15000, step=1000)
-                    st.session_state.commercial_filters["min_rent"] = exact_rent
-                    st.session_state.commercial_filters["max_rent"] = exact_rent
-                else:  # Range
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        min_rent = st.number_input("Min rent (₹)", min_value=1000, value=10000, step=1000)
-                    with col2:
-                        max_rent = st.number_input("Max rent (₹)", min_value=1000, value=25000, step=1000)
-                    st.session_state.commercial_filters["min_rent"] = min_rent
-                    st.session_state.commercial_filters["max_rent"] = max_rent
-                    
-            elif quick_search == "Area":
-                area = st.selectbox("Select area in Nagpur", ["Any"] + areas)
-                if area != "Any":
-                    st.session_state.commercial_filters["area"] = area
-                
-            elif quick_search == "Property Type":
-                prop_type = st.selectbox("Select property type", ["Any"] + property_types)
-                if prop_type != "Any":
-                    st.session_state.commercial_filters["property_type"] = prop_type
-                
-            elif quick_search == "Size":
-                size_option = st.radio(
-                    "Size preference",
-                    ["Below size", "Above size", "Exact size", "Range"]
-                )
-                
-                if size_option == "Below size":
-                    max_size = st.number_input("Maximum size (sqft)", min_value=100, value=2000, step=100)
-                    st.session_state.commercial_filters["max_size"] = max_size
-                elif size_option == "Above size":
-                    min_size = st.number_input("Minimum size (sqft)", min_value=100, value=1000, step=100)
-                    st.session_state.commercial_filters["min_size"] = min_size
-                elif size_option == "Exact size":
-                    exact_size = st.number_input("Exact size (sqft)", min_value=100, value=1500, step=100)
-                    st.session_state.commercial_filters["min_size"] = exact_size
-                    st.session_state.commercial_filters["max_size"] = exact_size
-                else:  # Range
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        min_size = st.number_input("Min size (sqft)", min_value=100, value=1000, step=100)
-                    with col2:
-                        max_size = st.number_input("Max size (sqft)", min_value=100, value=2000, step=100)
-                    st.session_state.commercial_filters["min_size"] = min_size
-                    st.session_state.commercial_filters["max_size"] = max_size
-    
-    # Advanced Search Mode
-    elif search_mode == "Advanced Search":
+    # Advanced filter form as a fragment: editing its widgets reruns only the form, not the result views
+    @st.fragment
+    def advanced_filter_form():
         with st.expander("Advanced Filter Options", expanded=True):
             # Display current property count
             st.markdown(f"📊 Showing all {len(st.session_state.commercial_filtered_properties)} properties")
@@ -1475,112 +1630,121 @@ def run_commercial_app():
                     st.rerun()
             with col2:
                 if st.button("View current properties"):
-                    # Build filters dictionary
+                    # Build filters dictionary from the set widgets, in display order
+                    widget_values = [
+                        ("min_size", min_size), ("max_size", max_size),
+                        ("min_carpet_area", min_carpet), ("max_carpet_area", max_carpet),
+                        ("min_age", min_age), ("max_age", max_age),
+                        ("brokerage", brokerage),
+                        ("property_id", property_id),
+                        ("furnishing", furnishing),
+                        ("min_security_deposit", min_deposit), ("max_security_deposit", max_deposit),
+                        ("min_rent", min_rent), ("max_rent", max_rent),
+                        ("area", area), ("zone", zone), ("floor_no", floor_no),
+                        ("min_total_floors", min_total_floors), ("max_total_floors", max_total_floors),
+                        ("property_type", property_type), ("ownership", ownership),
+                        ("possession_status", possession_status), ("location_hub", location_hub),
+                        ("facilities", selected_facilities),
+                        ("min_lock_in_period", min_lock_in), ("max_lock_in_period", max_lock_in)
+                    ]
                     filters = {}
-                    
-                    # Size filters
-                    if min_size > 0:
-                        filters["min_size"] = min_size
-                    if max_size > 0:
-                        filters["max_size"] = max_size
-                    
-                    # Carpet area filters
-                    if min_carpet > 0:
-                        filters["min_carpet_area"] = min_carpet
-                    if max_carpet > 0:
-                        filters["max_carpet_area"] = max_carpet
-                    
-                    # Age filters
-                    if min_age > 0:
-                        filters["min_age"] = min_age
-                    if max_age > 0:
-                        filters["max_age"] = max_age
-                    
-                    # Brokerage filter
-                    if brokerage:
-                        # Handle multiple selections
-                        if len(brokerage) == 1:
-                            filters["brokerage"] = brokerage[0].lower()
-                        else:
-                            # For multiple selections, we need to handle it differently
-                            # We'll create a custom filter for this
-                            filters["brokerage_list"] = [b.lower() for b in brokerage]
-                    
-                    # Property ID filter
-                    if property_id:
-                        filters["property_id"] = property_id
-                    
-                    # Furnishing filter
-                    if furnishing:
-                        # Handle multiple selections
-                        if len(furnishing) == 1:
-                            filters["furnishing"] = furnishing[0].lower()
+                    for key, value in widget_values:
+                        if not value:
+                            continue  # numbers at 0, empty text and empty selections are unset
+                        if key in SINGLE_CHOICE_FILTERS:
+                            # One selection filters on its value, several go under a "_list" key
+                            if len(value) == 1:
+                                filters[key] = value[0].lower()
+                            else:
+                                filters[key + "_list"] = [v.lower() for v in value]
                         else:
-                            # For multiple selections, we need to handle it differently
-                            # We'll create a custom filter for this
-                            filters["furnishing_list"] = [f.lower() for f in furnishing]
-                    
-                    # Security deposit filters
-                    if min_deposit > 0:
-                        filters["min_security_deposit"] = min_deposit
-                    if max_deposit > 0:
-                        filters["max_security_deposit"] = max_deposit
-                    
-                    # Rent filters
-                    if min_rent > 0:
-                        filters["min_rent"] = min_rent
-                    if max_rent > 0:
-                        filters["max_rent"] = max_rent
-                    
-                    # Area filter
-                    if area:
-                        filters["area"] = area
-                    
-                    # Zone filter
-                    if zone:
-                        filters["zone"] = zone
-                    
-                    # Floor number filter
-                    if floor_no:
-                        filters["floor_no"] = floor_no
-                    
-                    # Total floors filters
-                    if min_total_floors > 0:
-                        filters["min_total_floors"] = min_total_floors
-                    if max_total_floors > 0:
-                        filters["max_total_floors"] = max_total_floors
-                    
-                    # Property type filter
-                    if property_type:
-                        filters["property_type"] = property_type
-                    
-                    # Ownership filter
-                    if ownership:
-                        filters["ownership"] = ownership
-                    
-                    # Possession status filter
-                    if possession_status:
-                        filters["possession_status"] = possession_status
-                    
-                    # Location hub filter
-                    if location_hub:
-                        filters["location_hub"] = location_hub
-                    
-                    # Facilities filter
-                    if selected_facilities:
-                        filters["facilities"] = selected_facilities
-                    
-                    # Lock-in period filters
-                    if min_lock_in > 0:
-                        filters["min_lock_in_period"] = min_lock_in
-                    if max_lock_in > 0:
-                        filters["max_lock_in_period"] = max_lock_in
+                            filters[key] = value
                     
                     # Apply filters
                     st.session_state.commercial_filters = filters
-                    st.session_state.commercial_filtered_properties = filter_properties(properties_data, filters)
+                    st.session_state.commercial_filtered_properties = filter_properties(properties_data, properties_df, properties_flag_words, filters)
                     st.rerun()
     
+    # Search Filters section
+    st.subheader("🔍 Search Filters")
+    search_mode = st.radio(
+        "Select Search Mode",
+        ["Simple Search", "Advanced Search", "Compare Properties"]
+    )
+    
+    # Simple Search Mode
+    if search_mode == "Simple Search":
+        with st.expander("Quick Search Options", expanded=True):
+            # Quick search options
+            quick_search = st.selectbox(
+                "Select search criteria",
+                ["Rent Price", "Area", "Property Type", "Size"]
+            )
+            
+            if quick_search == "Rent Price":
+                rent_option = st.radio(
+                    "Rent preference",
+                    ["Below budget", "Above budget", "Exact amount", "Range"]
+                )
+                
+                if rent_option == "Below budget":
+                    max_rent = st.number_input("Maximum rent (₹)", min_value=1000, value=20000, step=1000)
+                    st.session_state.commercial_filters["max_rent"] = max_rent
+                elif rent_option == "Above budget":
+                    min_rent = st.number_input("Minimum rent (₹)", min_value=1000, value=10000, step=1000)
+                    st.session_state.commercial_filters["min_rent"] = min_rent
+                elif rent_option == "Exact amount":
+                    exact_rent = st.number_input("Exact rent (₹)", min_value=1000, value=15000, step=1000)
+                    st.session_state.commercial_filters["min_rent"] = exact_rent
+                    st.session_state.commercial_filters["max_rent"] = exact_rent
+                else:  # Range
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        min_rent = st.number_input("Min rent (₹)", min_value=1000, value=10000, step=1000)
+                    with col2:
+                        max_rent = st.number_input("Max rent (₹)", min_value=1000, value=25000, step=1000)
+                    st.session_state.commercial_filters["min_rent"] = min_rent
+                    st.session_state.commercial_filters["max_rent"] = max_rent
+                    
+            elif quick_search == "Area":
+                area = st.selectbox("Select area in Nagpur", ["Any"] + areas)
+                if area != "Any":
+                    st.session_state.commercial_filters["area"] = area
+                
+            elif quick_search == "Property Type":
+                prop_type = st.selectbox("Select property type", ["Any"] + property_types)
+                if prop_type != "Any":
+                    st.session_state.commercial_filters["property_type"] = prop_type
+                
+            elif quick_search == "Size":
+                size_option = st.radio(
+                    "Size preference",
+                    ["Below size", "Above size", "Exact size", "Range"]
+                )
+                
+                if size_option == "Below size":
+                    max_size = st.number_input("Maximum size (sqft)", min_value=100, value=2000, step=100)
+                    st.session_state.commercial_filters["max_size"] = max_size
+                elif size_option == "Above size":
+                    min_size = st.number_input("Minimum size (sqft)", min_value=100, value=1000, step=100)
+                    st.session_state.commercial_filters["min_size"] = min_size
+                elif size_option == "Exact size":
+                    exact_size = st.number_input("Exact size (sqft)", min_value=100, value=1500, step=100)
+                    st.session_state.commercial_filters["min_size"] = exact_size
+                    st.session_state.commercial_filters["max_size"] = exact_size
+                else:  # Range
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        min_size = st.number_input("Min size (sqft)", min_value=100, value=1000, step=100)
+                    with col2:
+                        max_size = st.number_input("Max size (sqft)", min_value=100, value=2000, step=100)
+                    st.session_state.commercial_filters["min_size"] = min_size
+                    st.session_state.commercial_filters["max_size"] = max_size
+    
+    # Advanced Search Mode
+    elif search_mode == "Advanced Search":
+        advanced_filter_form()
+    
     # Compare Properties Mode
     else:  # Compare Properties
         with st.expander("Property Comparison Options", expanded=True):
@@ -1611,18 +1775,23 @@ def run_commercial_app():
                     # For comparison mode, we don't filter the properties
                     st.session_state.commercial_filtered_properties = properties_data
                 else:
-                    st.session_state.commercial_filtered_properties = filter_properties(properties_data, filters)
+                    st.session_state.commercial_filtered_properties = filter_properties(properties_data, properties_df, properties_flag_words, filters)
         with col2:
             if st.button("Reset Filters"):
                 st.session_state.commercial_filters = {}
                 st.session_state.commercial_filtered_properties = properties_data
                 st.rerun()
     
+    # Session state read once; the sections below use these locals
+    active_filters = st.session_state.commercial_filters
+    results = st.session_state.commercial_filtered_properties
+    user_location = st.session_state.commercial_user_location
+    
     # Display current filters
-    if st.session_state.commercial_filters and search_mode != "Advanced Search":
+    if active_filters and search_mode != "Advanced Search":
         st.subheader("Active Filters")
         cols = st.columns(4)
-        for i, (filter_type, value) in enumerate(st.session_state.commercial_filters.items()):
+        for i, (filter_type, value) in enumerate(active_filters.items()):
             if filter_type in ["min_rent", "max_rent", "min_size", "max_size", 
                               "min_carpet_area", "max_carpet_area", 
                               "min_age", "max_age", 
@@ -1636,10 +1805,10 @@ def run_commercial_app():
                     st.text(f"{filter_type.replace('_', ' ').title()}: {value}")
     
     # Main content area
-    if st.session_state.commercial_filters:
+    if active_filters:
         # Handle comparison mode
-        if search_mode == "Compare Properties" and "compare" in st.session_state.commercial_filters:
-            property_ids = [pid.strip().lower() for pid in st.session_state.commercial_filters["compare"].split(",")]
+        if search_mode == "Compare Properties" and "compare" in active_filters:
+            property_ids = _ID_SPLIT_RE.split(active_filters["compare"].strip().lower())
             if len(property_ids) < 2:
                 st.warning("⚠️ Please enter at least two Property IDs to compare.")
             else:
@@ -1647,41 +1816,59 @@ def run_commercial_app():
                 compare_properties_side_by_side(properties_data, property_ids)
         else:
             # Display results
-            if not st.session_state.commercial_filtered_properties:
+            if not results:
                 st.warning("❌ No properties found matching your criteria in Nagpur.")
             else:
-                st.success(f"✅ Found {len(st.session_state.commercial_filtered_properties)} properties matching your criteria in Nagpur.")
+                st.success(f"✅ Found {len(results)} properties matching your criteria in Nagpur.")
                 
-                # Create tabs for different views
-                tab1, tab2, tab3 = st.tabs(["List View", "Map View", "Analytics"])
+                # Distances are attached once here and reused by the list, map and analytics views
+                located = None
+                if user_location:
+                    located = add_distances(results, user_location)
                 
-                with tab1:
+                # Only the selected view is built on each rerun
+                active_view = st.radio("View", ["List View", "Map View", "Analytics"], horizontal=True, key="commercial_view")
+                
+                if active_view == "List View":
                     # Group by property type
-                    grouped_results = defaultdict(list)
-                    for prop in st.session_state.commercial_filtered_properties:
-                        property_type = prop.get("property_type", "Other/Unspecified Type")
-                        grouped_results[property_type].append(prop)
+                    grouped_results = group_by_type(tuple(p.get("property_id") for p in results), results)
                     
                     # Display results grouped by property type
-                    for prop_type, props in grouped_results.items():
-                        st.subheader(f"🏠 Property Type: {str(prop_type).title()} ({len(props)} results)")
+                    for prop_type, positions in grouped_results.items():
+                        st.subheader(f"🏠 Property Type: {str(prop_type).title()} ({len(positions)} results)")
+                        
+                        # Only the selected page of each group is formatted; picking a page reruns the
+                        # script, and the applied results persist in session state across that rerun
+                        page_count = -(-len(positions) // LIST_PAGE_SIZE)
+                        if page_count > 1:
+                            page = st.selectbox("Page", range(1, page_count + 1), key=f"commercial_page_{prop_type}") - 1
+                            positions = positions[page * LIST_PAGE_SIZE:(page + 1) * LIST_PAGE_SIZE]
                         
                         # Create columns for better layout
                         cols = st.columns(2)
-                        for i, prop in enumerate(props):
+                        for i, position in enumerate(positions):
+                            prop = results[position]
                             # Get distance if user location is set
-                            distance = prop.get("distance_from_user", None) if st.session_state.commercial_user_location else None
+                            distance = prop.get("distance_from_user", None) if user_location else None
                             
                             with cols[i % 2]:
-                                with st.expander(f"ID: {prop.get('property_id', 'N/A')} | Rent: ₹{prop.get('rent_price', 'N/A')}"):
-                                    st.markdown(format_property(prop, distance))
+                                with st.expander(
+                                    f"ID: {prop.get('property_id', 'N/A')} | Rent: ₹{prop.get('rent_price', 'N/A')}",
+                                    key=f"commercial_details_{prop.get('property_id', position)}",
+                                    on_change="rerun"
+                                ) as details:
+                                    # Details are only formatted while the expander is open; the rerun on
+                                    # open/close keeps the current results, which persist in session state
+                                    if details.open:
+                                        st.markdown(format_property(prop, distance))
                 
-                with tab2:
+                elif active_view == "Map View":
                     st.subheader("Property Locations in Nagpur")
                     
                     # Create and display the map
                     try:
-                        property_map, avg_distance = create_property_map(st.session_state.commercial_filtered_properties, st.session_state.commercial_user_location)
+                        from streamlit_folium import folium_static
+                        property_map, avg_distance = create_property_map(results, user_location, located)
                         folium_static(property_map, width=700, height=500)
                         
                         # Add map controls explanation
@@ -1703,102 +1890,88 @@ def run_commercial_app():
                         st.error(f"Error displaying map: {str(e)}")
                         st.info("Please check if you have a stable internet connection for map loading.")
                 
-                with tab3:
+                else:
                     st.subheader("Property Analytics for Nagpur")
                     
-                    # Create analytics visualizations
-                    if st.session_state.commercial_filtered_properties:
+                    # Distributions need at least two results; skip building the charts otherwise
+                    if len(results) < 2:
+                        st.info("Not enough results for analytics. Broaden your filters to see charts.")
+                    else:
+                        import plotly.express as px
+                        import plotly.graph_objects as go
+                        
                         # Convert to DataFrame for easier analysis
-                        df = pd.DataFrame(st.session_state.commercial_filtered_properties)
+                        df, type_counts, area_counts, furnishing_counts = analytics_data(
+                            tuple(p.get("property_id") for p in results),
+                            user_location,
+                            results
+                        )
                         
                         # Rent distribution
                         st.subheader("Rent Distribution in Nagpur")
-                        fig_rent = px.histogram(
-                            df, 
-                            x="rent_price", 
-                            nbins=20,
-                            title="Distribution of Property Rents in Nagpur",
-                            labels={"rent_price": "Rent (₹)", "count": "Number of Properties"}
-                        )
-                        st.plotly_chart(fig_rent, use_container_width=True)
+                        fig_rent = histogram_figure(df["rent_price"], 20, "Distribution of Property Rents in Nagpur", "Rent (₹)")
+                        st.plotly_chart(fig_rent, use_container_width=True, key="commercial_rent_hist")
                         
                         # Property types
                         st.subheader("Property Types in Nagpur")
-                        type_counts = df["property_type"].value_counts()
                         fig_types = px.pie(
                             values=type_counts.values,
                             names=type_counts.index,
                             title="Distribution of Property Types in Nagpur"
                         )
-                        st.plotly_chart(fig_types, use_container_width=True)
+                        st.plotly_chart(fig_types, use_container_width=True, key="commercial_type_pie")
                         
                         # Area distribution
-                        if "area" in df.columns:
+                        if area_counts is not None:
                             st.subheader("Properties by Area in Nagpur")
-                            area_counts = df["area"].value_counts()
                             fig_area = px.bar(
                                 x=area_counts.index,
                                 y=area_counts.values,
                                 labels={"x": "Area", "y": "Number of Properties"},
                                 title="Properties by Area in Nagpur"
                             )
-                            st.plotly_chart(fig_area, use_container_width=True)
+                            st.plotly_chart(fig_area, use_container_width=True, key="commercial_area_bar")
                         
                         # Size vs Rent scatter plot
                         st.subheader("Size vs Rent")
-                        fig_scatter = px.scatter(
-                            df,
-                            x="size_in_sqft",
-                            y="rent_price",
-                            color="property_type",
-                            hover_name="listing_title",
-                            labels={"size_in_sqft": "Size (sqft)", "rent_price": "Rent (₹)"},
-                            title="Size vs Rent by Property Type"
-                        )
-                        st.plotly_chart(fig_scatter, use_container_width=True)
+                        if len(df) > SCATTER_POINT_LIMIT:
+                            fig_scatter = density_figure(df["size_in_sqft"], df["rent_price"], 40, "Size vs Rent Density", "Size (sqft)", "Rent (₹)")
+                        else:
+                            fig_scatter = px.scatter(
+                                df,
+                                x="size_in_sqft",
+                                y="rent_price",
+                                color="property_type",
+                                hover_name="listing_title",
+                                labels={"size_in_sqft": "Size (sqft)", "rent_price": "Rent (₹)"},
+                                title="Size vs Rent by Property Type",
+                                render_mode="webgl"
+                            )
+                        st.plotly_chart(fig_scatter, use_container_width=True, key="commercial_scatter")
                         
                         # Property age distribution
                         st.subheader("Property Age Distribution")
-                        fig_age = px.histogram(
-                            df,
-                            x="property_age",
-                            nbins=15,
-                            title="Distribution of Property Ages",
-                            labels={"property_age": "Age (years)", "count": "Number of Properties"}
-                        )
-                        st.plotly_chart(fig_age, use_container_width=True)
+                        fig_age = histogram_figure(df["property_age"], 15, "Distribution of Property Ages", "Age (years)")
+                        st.plotly_chart(fig_age, use_container_width=True, key="commercial_age_hist")
                         
                         # Furnishing status
-                        furnishing_counts = {"Furnished": 0, "Unfurnished": 0}
-                        for prop in st.session_state.commercial_filtered_properties:
-                            if prop.get("facilities", {}).get("furnishing") == 1:
-                                furnishing_counts["Furnished"] += 1
-                            else:
-                                furnishing_counts["Unfurnished"] += 1
-                        
                         st.subheader("Furnishing Status")
                         fig_furnishing = px.pie(
                             values=list(furnishing_counts.values()),
                             names=list(furnishing_counts.keys()),
                             title="Distribution of Furnishing Status"
                         )
-                        st.plotly_chart(fig_furnishing, use_container_width=True)
+                        st.plotly_chart(fig_furnishing, use_container_width=True, key="commercial_furnishing_pie")
                         
                         # Distance distribution if user location is set
-                        if st.session_state.commercial_user_location and "distance_from_user" in df.columns:
+                        if user_location and "distance_from_user" in df.columns:
                             st.subheader("Distance Distribution from Your Location")
-                            fig_distance = px.histogram(
-                                df,
-                                x="distance_from_user",
-                                nbins=15,
-                                title="Distribution of Property Distances from Your Location",
-                                labels={"distance_from_user": "Distance (km)", "count": "Number of Properties"}
-                            )
+                            fig_distance = histogram_figure(df["distance_from_user"], 15, "Distribution of Property Distances from Your Location", "Distance (km)")
                             # Add average distance line
                             avg_distance = df["distance_from_user"].mean()
                             fig_distance.add_vline(x=avg_distance, line_dash="dash", line_color="red",
                                                  annotation_text=f"Avg: {avg_distance:.2f} km")
-                            st.plotly_chart(fig_distance, use_container_width=True)
+                            st.plotly_chart(fig_distance, use_container_width=True, key="commercial_distance_hist")
                             
                             # Distance bar graph with average line
                             st.subheader("Property Distance from Your Location")
@@ -1831,7 +2004,7 @@ def run_commercial_app():
                                 yaxis_title="Distance (km)",
                                 barmode='group'
                             )
-                            st.plotly_chart(fig_bar, use_container_width=True)
+                            st.plotly_chart(fig_bar, use_container_width=True, key="commercial_distance_bar")
     else:
         # Display welcome message and sample properties
         st.header("Welcome to Commercial Property Search - Nagpur")
@@ -1850,7 +2023,7 @@ def run_commercial_app():
         
         # Display some sample properties
         st.subheader("Featured Properties in Nagpur")
-        sample_properties = properties_data[:4] if len(properties_data) >= 4 else properties_data
+        sample_properties = properties_data[:4]
         
         cols = st.columns(2)
         for i, prop in enumerate(sample_properties):
@@ -1860,12 +2033,15 @@ def run_commercial_app():
 
 # App 3: PG Finder
 def run_pg_app():
+    import folium
+    import plotly.express as px
+    from streamlit_folium import folium_static
+    
     st.title("🏠 PG Listings Dashboard")
     
     # Load JSON data
     try:
-        with open("pg.json", "r") as f:
-            pg_data = json.load(f)
+        pg_data = load_json_file("pg.json")
         df = pd.DataFrame(pg_data)
     except FileNotFoundError:
         st.error("pg.json file not found. Please ensure the file exists.")
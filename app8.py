@@ -1,14 +1,13 @@
 import os
+import hashlib
 import numpy as np
 import cv2
-import imagehash
 from PIL import Image
 import streamlit as st
-import tensorflow as tf
-from tensorflow.keras.applications import ResNet50
 import shutil
 from datetime import datetime
 import json
+import io
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
@@ -27,169 +26,151 @@ This tool helps verify the authenticity of property listing images by detecting:
 """)
 
 # Create directories if they don't exist
-for directory in ["temp_uploads", "flagged_images", "approved_images", "rejected_images"]:
+for directory in ["flagged_images", "approved_images", "rejected_images"]:
     os.makedirs(directory, exist_ok=True)
 
+# Perceptual hashes of accepted uploads persist on disk as raw uint64 values
+HASHES_PATH = "image_hashes.u64"
+
 # Initialize session state variables
 if 'existing_hashes' not in st.session_state:
-    st.session_state.existing_hashes = set()
+    if os.path.exists(HASHES_PATH):
+        st.session_state.existing_hashes = np.fromfile(HASHES_PATH, dtype=np.uint64)
+    else:
+        st.session_state.existing_hashes = np.empty(0, dtype=np.uint64)
+if 'upload_key' not in st.session_state:
+    st.session_state.upload_key = None  # content hash of the last analyzed upload
 
 # Function to calculate perceptual hash
-def calculate_phash(image, hash_size=8):
-    """Calculate perceptual hash of an image"""
+def calculate_phash(gray, hash_size=8):
+    """Calculate perceptual hash of a grayscale image array"""
     try:
-        return imagehash.phash(image, hash_size=hash_size)
-    except Exception as e:
-        st.error(f"Error calculating phash: {e}")
-        return None
-
-# Function to extract features using ResNet50
-def extract_features(image):
-    """Extract features from an image using ResNet50"""
-    try:
-        # Load the pre-trained ResNet50 model
-        model = ResNet50(weights='imagenet', include_top=False, pooling='avg')
-        
-        # Resize and preprocess the image
-        img = image.resize((224, 224))
-        img_array = tf.keras.preprocessing.image.img_to_array(img)
-        img_array = np.expand_dims(img_array, axis=0)
-        img_array = tf.keras.applications.resnet50.preprocess_input(img_array)
+        # Shrink the grayscale image to 4x the hash size and keep the low-frequency DCT block
+        small = cv2.resize(gray, (hash_size * 4, hash_size * 4), interpolation=cv2.INTER_AREA)
+        low_freq = cv2.dct(small.astype(np.float32))[:hash_size, :hash_size]
         
-        # Extract features
-        features = model.predict(img_array)
-        return features.flatten()
+        # One bit per coefficient above the median, packed into an integer
+        bits = (low_freq > np.median(low_freq)).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
     except Exception as e:
-        st.error(f"Error extracting features: {e}")
+        st.error(f"Error calculating phash: {e}")
         return None
 
 # Function to check if an image is a duplicate
-def check_duplicate(image, existing_hashes, threshold=5):
-    """Check if an image is a duplicate of any existing images"""
-    img_hash = calculate_phash(image)
+def check_duplicate(img_hash, existing_hashes, threshold=5):
+    """Check if an image hash is a duplicate of any existing image hashes"""
     if img_hash is None:
         return False, 0
     
-    for existing_hash in existing_hashes:
-        if img_hash - existing_hash < threshold:
-            return True, img_hash - existing_hash
+    # Hamming distance to every stored hash: popcount of the XOR, in one vectorized pass
+    xor = existing_hashes ^ np.uint64(img_hash)
+    distances = np.unpackbits(xor.view(np.uint8)).reshape(len(xor), 64).sum(axis=1)
+    matches = np.flatnonzero(distances < threshold)
+    if matches.size:
+        return True, int(distances[matches[0]])
     
     return False, 0
 
+# Function to compute the pixel statistics shared by the checks
+def analyze_pixels(rgb, gray):
+    """Compute grayscale statistics, edges, contours and color histograms of an image in one place"""
+    # Grayscale statistics and edges
+    # (cv2.Canny already spreads its rows over OpenCV's thread pool, so it runs on the whole image)
+    edges = cv2.Canny(gray, 100, 200)
+    
+    # External contours of the edge map
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # Normalized 256-bin histogram of each channel, counted in one pass over the pixels
+    channel_offsets = np.array([0, 256, 512], dtype=np.uint16)
+    counts = np.bincount((rgb + channel_offsets).ravel(), minlength=3 * 256).reshape(3, 256)
+    histograms = counts / counts.sum(axis=1, keepdims=True)
+    
+    return {
+        "size": gray.size,
+        "std_dev": np.std(gray),
+        "edge_density": np.count_nonzero(edges) / edges.size,
+        "contours": contours,
+        "histograms": histograms
+    }
+
 # Function to check if an image is AI-generated
-def check_ai_generated(image):
+def check_ai_generated(pixels):
     """Check if an image is AI-generated"""
     # For demonstration purposes, we'll simulate this check
     # In a real implementation, this would use a trained model
     
-    # Extract features
-    features = extract_features(image)
-    if features is None:
-        return False, 0
-    
     # Simulate AI detection with a heuristic
     # AI-generated images often have certain statistical properties
     # This is a simplified version - real detection would use a trained model
     
-    # Calculate some basic statistics
-    gray = np.array(image.convert('L'))
-    
-    # Calculate the standard deviation of pixel values
-    std_dev = np.std(gray)
-    
-    # Calculate the edge density
-    edges = cv2.Canny(gray, 100, 200)
-    edge_density = np.sum(edges > 0) / edges.size
+    # Standard deviation of pixel values and edge density
+    std_dev = pixels["std_dev"]
+    edge_density = pixels["edge_density"]
     
     # Simulate a confidence score based on these features
     # AI-generated images often have lower edge density and different std dev
+    # (each term is bounded, so the score stays within [0.3, 1])
     confidence = 0.3 + 0.4 * (1 - edge_density) + 0.3 * (std_dev / 255)
     
-    # Add some randomness to make it more realistic
-    confidence += np.random.uniform(-0.1, 0.1)
-    confidence = max(0, min(1, confidence))
-    
     is_ai = confidence > 0.6
     
     return is_ai, confidence
 
 # Function to check if an image is a stock photo
-def check_stock_image(image):
+def check_stock_image(pixels):
     """Check if an image is a stock photo"""
     # For demonstration purposes, we'll simulate this check
     # In a real implementation, this would compare against a database of stock images
     
-    # Extract features
-    features = extract_features(image)
-    if features is None:
-        return False, 0
-    
     # Simulate stock image detection with a heuristic
     # Stock photos often have certain characteristics like perfect composition, lighting, etc.
     
-    # Calculate color histogram
-    img_array = np.array(image)
-    hist_b = cv2.calcHist([img_array], [0], None, [256], [0, 256])
-    hist_g = cv2.calcHist([img_array], [1], None, [256], [0, 256])
-    hist_r = cv2.calcHist([img_array], [2], None, [256], [0, 256])
-    
-    # Normalize histograms
-    hist_b = hist_b / hist_b.sum()
-    hist_g = hist_g / hist_g.sum()
-    hist_r = hist_r / hist_r.sum()
-    
     # Calculate histogram uniformity (stock photos often have more uniform histograms)
-    uniformity = np.mean([np.std(hist_b), np.std(hist_g), np.std(hist_r)])
+    uniformity = pixels["histograms"].std(axis=1).mean()
     
     # Simulate a confidence score
-    confidence = 0.2 + 0.6 * (1 - uniformity) + 0.2 * np.random.random()
+    confidence = 0.3 + 0.6 * (1 - uniformity)
     
     is_stock = confidence > 0.7
     
     return is_stock, confidence
 
 # Function to check if an image is property-related
-def check_property_related(image):
+def check_property_related(pixels):
     """Check if an image contains property-related content"""
     # For demonstration purposes, we'll simulate this check
     # In a real implementation, this would use a trained scene classifier
     
-    # Extract features
-    features = extract_features(image)
-    if features is None:
-        return False, 0
-    
-    # Convert to grayscale for edge detection
-    gray = np.array(image.convert('L'))
+    # Filter contours by area, collecting every area into one array first
+    contours = pixels["contours"]
+    min_area = pixels["size"] * 0.001  # Contours must be at least 0.1% of the image
+    areas = np.fromiter((cv2.contourArea(cnt) for cnt in contours), dtype=np.float64, count=len(contours))
+    large_contours = [contours[i] for i in np.flatnonzero(areas > min_area)]
     
-    # Detect edges
-    edges = cv2.Canny(gray, 100, 200)
-    
-    # Find contours
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    # Filter contours by area
-    min_area = gray.size * 0.001  # Contours must be at least 0.1% of the image
-    large_contours = [cnt for cnt in contours if cv2.contourArea(cnt) > min_area]
-    
-    # Count corners in large contours
-    corner_count = 0
-    for cnt in large_contours:
-        epsilon = 0.01 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-        corner_count += len(approx)
+    # Count corners in large contours (one arcLength per surviving contour)
+    corner_count = sum(
+        len(cv2.approxPolyDP(cnt, 0.01 * cv2.arcLength(cnt, True), True))
+        for cnt in large_contours
+    )
     
     # Normalize corner count by image size
-    normalized_corners = corner_count / (gray.size / 10000)
+    normalized_corners = corner_count / (pixels["size"] / 10000)
     
     # Property images often have many corners (rooms, furniture, etc.)
     # Simulate a confidence score based on corner count
-    confidence = 0.2 + 0.6 * min(normalized_corners / 10, 1) + 0.2 * np.random.random()
+    confidence = 0.3 + 0.6 * min(normalized_corners / 10, 1)
     
     is_property = confidence > 0.4
     
     return is_property, confidence
 
+# Function to list the images waiting for review
+@st.cache_data(ttl=5, show_spinner=False)
+def list_flagged_images(flagged_dir):
+    """List the flagged image files in a directory"""
+    return [f for f in os.listdir(flagged_dir) if f.endswith(('.jpg', '.jpeg', '.png'))]
+
 # Function to display the admin review panel
 def admin_review_panel():
     """Display the admin review panel for flagged images"""
@@ -198,7 +179,7 @@ def admin_review_panel():
     
     flagged_dir = "flagged_images"
     if os.path.exists(flagged_dir):
-        flagged_images = [f for f in os.listdir(flagged_dir) if f.endswith(('.jpg', '.jpeg', '.png'))]
+        flagged_images = list_flagged_images(flagged_dir)
         
         if flagged_images:
             selected_image = st.selectbox("Select an image to review", flagged_images)
@@ -240,7 +221,8 @@ def admin_review_panel():
                         if os.path.exists(metadata_path):
                             shutil.move(metadata_path, os.path.join(approved_dir, f"{selected_image}.json"))
                         st.success("Image approved and moved to approved directory.")
-                        st.experimental_rerun()
+                        list_flagged_images.clear()
+                        st.rerun()
                 
                 with col2:
                     if st.button("Reject Image"):
@@ -251,7 +233,8 @@ def admin_review_panel():
                         if os.path.exists(metadata_path):
                             shutil.move(metadata_path, os.path.join(rejected_dir, f"{selected_image}.json"))
                         st.success("Image rejected and moved to rejected directory.")
-                        st.experimental_rerun()
+                        list_flagged_images.clear()
+                        st.rerun()
                 
                 with col3:
                     if st.button("Delete Image"):
@@ -260,12 +243,45 @@ def admin_review_panel():
                         if os.path.exists(metadata_path):
                             os.remove(metadata_path)
                         st.success("Image and metadata deleted.")
-                        st.experimental_rerun()
+                        list_flagged_images.clear()
+                        st.rerun()
         else:
             st.info("No flagged images to review.")
     else:
         st.info("No flagged images directory found.")
 
+# Function to render a confusion matrix heatmap as PNG bytes
+@st.cache_data(show_spinner=False)
+def render_confusion_matrix(cm, labels):
+    """Render a confusion matrix heatmap once and return the PNG bytes"""
+    fig, ax = plt.subplots()
+    sns.heatmap(np.array(cm), annot=True, fmt='d', ax=ax, cmap='Blues', 
+               xticklabels=list(labels), 
+               yticklabels=list(labels))
+    ax.set_xlabel('Predicted')
+    ax.set_ylabel('Actual')
+    ax.set_title('Confusion Matrix')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+# Function to render the overall metrics bar chart as PNG bytes
+@st.cache_data(show_spinner=False)
+def render_metric_bars(metrics, values):
+    """Render the overall performance bar chart once and return the PNG bytes"""
+    fig, ax = plt.subplots()
+    ax.bar(metrics, values, color=['blue', 'green', 'red', 'purple'])
+    ax.set_ylim(0, 1)
+    ax.set_ylabel('Score')
+    ax.set_title('Overall Performance Metrics')
+    for i, v in enumerate(values):
+        ax.text(i, v + 0.01, f"{v:.2f}", ha='center')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
 # Function to evaluate model performance
 def evaluate_model_performance():
     """Evaluate and display model performance metrics"""
@@ -282,15 +298,8 @@ def evaluate_model_performance():
         st.write("F1 Score: 91%")
         
         # Display a confusion matrix
-        fig, ax = plt.subplots()
-        cm = np.array([[85, 15], [6, 94]])  # Example confusion matrix
-        sns.heatmap(cm, annot=True, fmt='d', ax=ax, cmap='Blues', 
-                   xticklabels=['Real', 'AI-Generated'], 
-                   yticklabels=['Real', 'AI-Generated'])
-        ax.set_xlabel('Predicted')
-        ax.set_ylabel('Actual')
-        ax.set_title('Confusion Matrix')
-        st.pyplot(fig)
+        cm = ((85, 15), (6, 94))  # Example confusion matrix
+        st.image(render_confusion_matrix(cm, ('Real', 'AI-Generated')), use_container_width=True)
     
     with tab2:
         st.subheader("Stock Image Detection")
@@ -300,15 +309,8 @@ def evaluate_model_performance():
         st.write("F1 Score: 87%")
         
         # Display a confusion matrix
-        fig, ax = plt.subplots()
-        cm = np.array([[80, 20], [10, 90]])  # Example confusion matrix
-        sns.heatmap(cm, annot=True, fmt='d', ax=ax, cmap='Blues', 
-                   xticklabels=['Original', 'Stock'], 
-                   yticklabels=['Original', 'Stock'])
-        ax.set_xlabel('Predicted')
-        ax.set_ylabel('Actual')
-        ax.set_title('Confusion Matrix')
-        st.pyplot(fig)
+        cm = ((80, 20), (10, 90))  # Example confusion matrix
+        st.image(render_confusion_matrix(cm, ('Original', 'Stock')), use_container_width=True)
     
     with tab3:
         st.subheader("Property Relevance Detection")
@@ -318,15 +320,8 @@ def evaluate_model_performance():
         st.write("F1 Score: 93%")
         
         # Display a confusion matrix
-        fig, ax = plt.subplots()
-        cm = np.array([[90, 10], [5, 95]])  # Example confusion matrix
-        sns.heatmap(cm, annot=True, fmt='d', ax=ax, cmap='Blues', 
-                   xticklabels=['Unrelated', 'Property'], 
-                   yticklabels=['Unrelated', 'Property'])
-        ax.set_xlabel('Predicted')
-        ax.set_ylabel('Actual')
-        ax.set_title('Confusion Matrix')
-        st.pyplot(fig)
+        cm = ((90, 10), (5, 95))  # Example confusion matrix
+        st.image(render_confusion_matrix(cm, ('Unrelated', 'Property')), use_container_width=True)
     
     with tab4:
         st.subheader("Overall System Performance")
@@ -335,16 +330,78 @@ def evaluate_model_performance():
         st.write("False Negative Rate: 4%")
         
         # Display a bar chart of performance metrics
-        fig, ax = plt.subplots()
-        metrics = ['Accuracy', 'Precision', 'Recall', 'F1 Score']
-        values = [0.89, 0.88, 0.93, 0.90]
-        ax.bar(metrics, values, color=['blue', 'green', 'red', 'purple'])
-        ax.set_ylim(0, 1)
-        ax.set_ylabel('Score')
-        ax.set_title('Overall Performance Metrics')
-        for i, v in enumerate(values):
-            ax.text(i, v + 0.01, f"{v:.2f}", ha='center')
-        st.pyplot(fig)
+        metrics = ('Accuracy', 'Precision', 'Recall', 'F1 Score')
+        values = (0.89, 0.88, 0.93, 0.90)
+        st.image(render_metric_bars(metrics, values), use_container_width=True)
+
+# Function to run every check on an uploaded image
+def analyze_upload(uploaded_file):
+    """Run the duplicate, AI, stock and property checks on an upload and flag it if suspicious"""
+    # Decode the pixels once; every check reads these two arrays
+    image = Image.open(uploaded_file)
+    rgb = np.asarray(image.convert('RGB'))
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    
+    # Check for duplicates
+    img_hash = calculate_phash(gray)
+    is_duplicate, duplicate_score = check_duplicate(img_hash, st.session_state.existing_hashes)
+    if not is_duplicate and img_hash is not None:
+        # Add to existing hashes
+        packed = np.array([img_hash], dtype=np.uint64)
+        st.session_state.existing_hashes = np.concatenate([st.session_state.existing_hashes, packed])
+        with open(HASHES_PATH, "ab") as f:
+            f.write(packed.tobytes())
+    
+    # Pixel statistics shared by the AI, stock and property checks
+    pixels = analyze_pixels(rgb, gray)
+    is_ai, ai_confidence = check_ai_generated(pixels)
+    is_stock, stock_similarity = check_stock_image(pixels)
+    is_property, property_confidence = check_property_related(pixels)
+    
+    # Calculate an overall score based on all checks
+    # In a real implementation, this would be a more sophisticated calculation
+    overall_score = (
+        (0 if is_duplicate else 0.25) +
+        (0 if is_ai else 0.25) +
+        (0 if is_stock else 0.25) +
+        (0.25 if is_property else 0)
+    )
+    
+    if overall_score <= 0.7:
+        # Add to flagged images
+        flagged_dir = "flagged_images"
+        os.makedirs(flagged_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        flagged_path = os.path.join(flagged_dir, f"{timestamp}_{uploaded_file.name}")
+        with open(flagged_path, "wb") as f:
+            f.write(uploaded_file.getbuffer())
+        
+        # Save metadata
+        metadata = {
+            "filename": uploaded_file.name,
+            "timestamp": timestamp,
+            "overall_score": overall_score,
+            "is_duplicate": is_duplicate,
+            "is_ai": is_ai,
+            "is_stock": is_stock,
+            "is_property": is_property
+        }
+        
+        with open(os.path.join(flagged_dir, f"{timestamp}_{uploaded_file.name}.json"), "w") as f:
+            json.dump(metadata, f)
+        list_flagged_images.clear()
+    
+    return {
+        "is_duplicate": is_duplicate,
+        "duplicate_score": duplicate_score,
+        "is_ai": is_ai,
+        "ai_confidence": ai_confidence,
+        "is_stock": is_stock,
+        "stock_similarity": stock_similarity,
+        "is_property": is_property,
+        "property_confidence": property_confidence,
+        "overall_score": overall_score
+    }
 
 # Main application
 def main():
@@ -357,95 +414,49 @@ def main():
         uploaded_file = st.file_uploader("Choose an image...", type=["jpg", "jpeg", "png"])
         
         if uploaded_file is not None:
-            # Display the uploaded image
-            image = Image.open(uploaded_file)
-            st.image(image, caption='Uploaded Image', use_column_width=True)
+            # Display the uploaded image (the browser decodes it; only analyze_upload opens it here)
+            st.image(uploaded_file, caption='Uploaded Image', use_column_width=True)
             
-            # Save the uploaded file temporarily
-            temp_dir = "temp_uploads"
-            os.makedirs(temp_dir, exist_ok=True)
-            temp_path = os.path.join(temp_dir, uploaded_file.name)
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Check each distinct upload once; reruns with the same bytes reuse its results
+            upload_key = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+            if st.session_state.upload_key != upload_key:
+                st.session_state.upload_results = analyze_upload(uploaded_file)
+                st.session_state.upload_key = upload_key
+            results = st.session_state.upload_results
             
-            # Perform checks
+            # Show the check results
             st.subheader("Image Analysis Results")
             
             # Check for duplicates
-            is_duplicate, duplicate_score = check_duplicate(image, st.session_state.existing_hashes)
-            if is_duplicate:
-                st.error(f"This image appears to be a duplicate (hash difference: {duplicate_score}).")
+            if results["is_duplicate"]:
+                st.error(f"This image appears to be a duplicate (hash difference: {results['duplicate_score']}).")
             else:
                 st.success("No duplicates found.")
-                # Add to existing hashes
-                img_hash = calculate_phash(image)
-                if img_hash is not None:
-                    st.session_state.existing_hashes.add(img_hash)
             
             # Check if AI-generated
-            is_ai, ai_confidence = check_ai_generated(image)
-            if is_ai:
-                st.error(f"This image appears to be AI-generated with {ai_confidence:.02f} confidence.")
+            if results["is_ai"]:
+                st.error(f"This image appears to be AI-generated with {results['ai_confidence']:.02f} confidence.")
             else:
-                st.success(f"This image does not appear to be AI-generated ({ai_confidence:.02f} confidence it's real).")
+                st.success(f"This image does not appear to be AI-generated ({results['ai_confidence']:.02f} confidence it's real).")
             
             # Check if stock image
-            is_stock, stock_similarity = check_stock_image(image)
-            if is_stock:
-                st.error(f"This image appears to be a stock photo with {stock_similarity:.02f} similarity.")
+            if results["is_stock"]:
+                st.error(f"This image appears to be a stock photo with {results['stock_similarity']:.02f} similarity.")
             else:
-                st.success(f"This image does not appear to be a stock photo (highest similarity: {stock_similarity:.02f}).")
+                st.success(f"This image does not appear to be a stock photo (highest similarity: {results['stock_similarity']:.02f}).")
             
             # Check if property-related
-            is_property, property_confidence = check_property_related(image)
-            if is_property:
-                st.success(f"This image appears to be property-related with {property_confidence:.02f} confidence.")
+            if results["is_property"]:
+                st.success(f"This image appears to be property-related with {results['property_confidence']:.02f} confidence.")
             else:
-                st.error(f"This image does not appear to be property-related ({property_confidence:.02f} confidence).")
+                st.error(f"This image does not appear to be property-related ({results['property_confidence']:.02f} confidence).")
             
             # Overall assessment
             st.subheader("Overall Assessment")
-            # Calculate an overall score based on all checks
-            # In a real implementation, this would be a more sophisticated calculation
-            overall_score = (
-                (0 if is_duplicate else 0.25) +
-                (0 if is_ai else 0.25) +
-                (0 if is_stock else 0.25) +
-                (0.25 if is_property else 0)
-            )
-            
-            # Add some randomness to make it more realistic
-            overall_score += np.random.uniform(-0.05, 0.05)
-            overall_score = max(0, min(1, overall_score))
-            
-            if overall_score > 0.7:
-                st.success(f"This image appears to be authentic with {overall_score:.02f} confidence.")
+            if results["overall_score"] > 0.7:
+                st.success(f"This image appears to be authentic with {results['overall_score']:.02f} confidence.")
             else:
-                st.error(f"This image is flagged as suspicious with {overall_score:.02f} confidence. It will be sent for admin review.")
-                
-                # Add to flagged images
-                flagged_dir = "flagged_images"
-                os.makedirs(flagged_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                flagged_path = os.path.join(flagged_dir, f"{timestamp}_{uploaded_file.name}")
-                shutil.copy(temp_path, flagged_path)
-                
-                # Save metadata
-                metadata = {
-                    "filename": uploaded_file.name,
-                    "timestamp": timestamp,
-                    "overall_score": overall_score,
-                    "is_duplicate": is_duplicate,
-                    "is_ai": is_ai,
-                    "is_stock": is_stock,
-                    "is_property": is_property
-                }
-                
-                with open(os.path.join(flagged_dir, f"{timestamp}_{uploaded_file.name}.json"), "w") as f:
-                    json.dump(metadata, f)
-            
-            # Clean up
-            os.remove(temp_path)
+                st.error(f"This image is flagged as suspicious with {results['overall_score']:.02f} confidence. It will be sent for admin review.")
     
     elif page == "Admin Review":
         admin_review_panel()